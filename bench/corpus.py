@@ -0,0 +1,77 @@
+# bench/corpus.py
+
+import json
+import os
+import random
+import sys
+from typing import List, Optional
+
+# bench 脚本和 src 里的模块一样用扁平 import
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+from batch_analyzer import parse_item  # noqa: E402
+
+# 没有真实语料时用模板拼一批“像 JD 的”文本：长度、段落、bullet、技能分布都接近真实贴子
+_COMPANIES = ["Netflix", "IBM", "KLA", "OpenAI", "Databricks", "Stripe", "Snowflake", "Nvidia"]
+_LEVELS = ["Intern", "Senior", "Staff", "New Grad", "", "Principal"]
+_ROLES = ["Data Engineer", "Machine Learning Engineer", "Research Scientist", "Software Engineer",
+          "Data Analyst", "Applied Scientist"]
+_SKILLS = ["Python", "SQL", "Java", "C++", "Scala", "Go", "AWS", "GCP", "Azure", "PyTorch",
+           "TensorFlow", "LangChain", "Spark", "Kafka", "Docker", "Kubernetes", "RAG", "LLMs",
+           "knowledge graphs", "reinforcement learning", "prompt optimization", "data engineering"]
+_VERBS = ["Design", "Build", "Develop", "Maintain", "Collaborate on", "Implement", "Deliver", "Own"]
+_OBJECTS = ["scalable data pipelines", "model inference services", "evaluation frameworks",
+            "internal analytics dashboards", "distributed training jobs", "retrieval systems",
+            "feature stores", "experimentation platforms"]
+_FILLER = ("We value curiosity, ownership and clear communication. Our teams work across research "
+           "and product to ship reliable systems used by millions of people. ")
+
+
+def synthetic_jd(rng: random.Random) -> str:
+    company = rng.choice(_COMPANIES)
+    level = rng.choice(_LEVELS)
+    role = f"{level} {rng.choice(_ROLES)}".strip()
+    req = rng.sample(_SKILLS, rng.randint(3, 7))
+    pref = rng.sample(_SKILLS, rng.randint(1, 4))
+    lines = [
+        "About the job",
+        f"At {company}, we are hiring a {role}.",
+        _FILLER * rng.randint(1, 6),
+        "Responsibilities",
+    ]
+    for _ in range(rng.randint(3, 9)):
+        lines.append(f"- {rng.choice(_VERBS)} {rng.choice(_OBJECTS)} using {rng.choice(req)}")
+    lines += [
+        "Required technical and professional expertise",
+        "- Bachelor's or Master's degree in Computer Science or related field",
+        f"- Experience with {', '.join(req)}",
+        "Preferred technical and professional experience",
+        f"- Experience with {', '.join(pref)} is a plus",
+    ]
+    return "\n".join(lines)
+
+
+def load_corpus(path: Optional[str] = None, n: int = 500, seed: int = 0) -> List[str]:
+    """
+    JD texts from an NDJSON file (strings or {"jd_text": ...} per line),
+    or `n` synthetic postings if no path is given.
+    """
+    if not path:
+        rng = random.Random(seed)
+        return [synthetic_jd(rng) for _ in range(n)]
+
+    texts = []
+    with open(path, "r", encoding="utf-8") as f:
+        for i, line in enumerate(f):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                _, _, text = parse_item(i, json.loads(line))
+            except ValueError:
+                continue
+            if text.strip():
+                texts.append(text)
+    return texts
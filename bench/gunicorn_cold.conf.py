@@ -0,0 +1,21 @@
+# bench/gunicorn_cold.conf.py
+#
+# Baseline for startup_bench.py: each worker imports the app itself
+# (no preload, no gc.freeze); only the startup-time hooks are added.
+
+import os
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import warm_start  # noqa: E402
+
+
+def post_fork(server, worker):
+    warm_start.record_fork(worker)
+
+
+def post_worker_init(worker):
+    warm_start.record_ready(worker)
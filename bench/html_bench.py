@@ -0,0 +1,138 @@
+# bench/html_bench.py
+#
+# 对比 HTML 抽取：旧版（整页 BeautifulSoup 建树）vs html_preprocessor 的流式扫描。
+# 报告每页解析耗时和 Python 堆峰值（tracemalloc）。
+#
+#   python bench/html_bench.py                        # 用合成的 LinkedIn 风格页面
+#   python bench/html_bench.py --fixtures saved_pages/  # 目录下所有 *.html
+#   python bench/html_bench.py --write-fixture page.html
+
+import argparse
+import glob
+import html as html_lib
+import json
+import os
+import random
+import re
+import time
+import tracemalloc
+from typing import Callable, Dict, List
+
+import corpus  # noqa: F401  (把 src 放进 sys.path)
+from corpus import synthetic_jd
+from html_preprocessor import scan_job_page
+
+
+def legacy_scan(html: str) -> Dict[str, str]:
+    """
+    The pre-streaming extraction: build the whole soup, then read the
+    title, the canonical link and the largest section/div text.
+    """
+    from bs4 import BeautifulSoup
+
+    soup = BeautifulSoup(html, "lxml")
+    canonical = soup.find("link", rel="canonical")
+    best_text = ""
+    for tag in soup.find_all(["section", "div"], recursive=True):
+        text = tag.get_text(separator=" ", strip=True)
+        if len(text) > len(best_text):
+            best_text = text
+    return {
+        "title": soup.title.text.strip() if soup.title and soup.title.text else "",
+        "canonical": canonical["href"] if canonical and canonical.get("href") else "",
+        "content_text": best_text,
+    }
+
+
+def _escape(text: str) -> str:
+    return html_lib.escape(text, quote=True).replace("+", "&#43;")
+
+
+def synthetic_page(seed: int = 0, json_kb: int = 1500, svg_icons: int = 400) -> str:
+    """
+    Roughly what a rendered LinkedIn job page looks like byte-wise: a
+    few KB of posting text inside megabytes of inline JSON, CSS and SVG.
+    """
+    rng = random.Random(seed)
+    # 真实页面会把 ' + & 转成实体（&#39; &#43; &amp;），lxml 把它们拆成单独的 data 事件
+    jd_html = "".join(f"<p>{_escape(line)}</p>" for line in synthetic_jd(rng).split("\n"))
+    jd_html += "<p>What you&#39;ll do: C&#43;&#43; services for our R&amp;D team.</p>"
+    blob = json.dumps([{"id": i, "k": "x" * 40, "v": [rng.random() for _ in range(4)]}
+                       for i in range(json_kb * 1024 // 120)])
+    icon = ('<svg viewBox="0 0 24 24" width="24" height="24"><path d="M12 2L2 7l10 5 10-5-10-5z'
+            ' M2 17l10 5 10-5 M2 12l10 5 10-5"/></svg>')
+    nav = "".join(f'<li><a href="/x/{i}">{icon}<span>Nav {i}</span></a></li>' for i in range(svg_icons))
+    css = ".c{color:#333;margin:0 auto}" * 4000
+    return (
+        "<!DOCTYPE html><html><head>"
+        "<title>Data Engineering Intern, Summer 2026 at Netflix | LinkedIn</title>"
+        '<link rel="canonical" href="https://www.linkedin.com/jobs/view/'
+        'data-engineering-intern-summer-2026-at-netflix-4348163604">'
+        f"<style>{css}</style>"
+        f'<script type="application/json">{blob}</script>'
+        "</head><body>"
+        f"<header><ul>{nav}</ul></header>"
+        '<div class="modal" hidden><div>Sign in to see more</div></div>'
+        f'<main><div class="jobs-description"><section class="description">{jd_html}</section></div></main>'
+        f"<script>window.__data = {blob[: len(blob) // 2]};</script>"
+        "</body></html>"
+    )
+
+
+def _measure(fn: Callable[[str], Dict], html: str, repeat: int) -> Dict:
+    tracemalloc.start()
+    fn(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    times: List[float] = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn(html)
+        times.append(time.perf_counter() - t0)
+    times.sort()
+    return {"median_ms": round(times[len(times) // 2] * 1000, 2), "peak_mb": round(peak / 2**20, 2)}
+
+
+def _norm(s: str) -> str:
+    return re.sub(r"\s+", " ", s).strip()
+
+
+def run(pages: Dict[str, str], repeat: int) -> List[Dict]:
+    rows = []
+    for name, html in pages.items():
+        old = _measure(legacy_scan, html, repeat)
+        new = _measure(scan_job_page, html, repeat)
+        rows.append({
+            "page": name,
+            "size_kb": round(len(html.encode("utf-8")) / 1024, 1),
+            "legacy": old,
+            "streaming": new,
+            "speedup": round(old["median_ms"] / new["median_ms"], 1) if new["median_ms"] else None,
+            "peak_mem_ratio": round(old["peak_mb"] / new["peak_mb"], 1) if new["peak_mb"] else None,
+            "same_content": _norm(legacy_scan(html)["content_text"]) == _norm(scan_job_page(html)["content_text"]),
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark HTML job-page extraction.")
+    parser.add_argument("--fixtures", help="directory of saved *.html pages")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--write-fixture", help="write the synthetic page to this path and exit")
+    args = parser.parse_args()
+
+    if args.write_fixture:
+        with open(args.write_fixture, "w", encoding="utf-8") as f:
+            f.write(synthetic_page())
+        raise SystemExit(0)
+
+    pages: Dict[str, str] = {}
+    if args.fixtures:
+        for path in sorted(glob.glob(os.path.join(args.fixtures, "*.html"))):
+            with open(path, "r", encoding="utf-8", errors="replace") as f:
+                pages[os.path.basename(path)] = f.read()
+    if not pages:
+        pages["synthetic-linkedin"] = synthetic_page()
+
+    print(json.dumps(run(pages, args.repeat), indent=2))
@@ -0,0 +1,286 @@
+# bench/load_test.py
+#
+# 本机压测 web_app：起 gunicorn（每组 workers x threads 一次），
+# 用语料回放 POST /analyze，报告延迟分位数、错误率、吞吐和每个 worker 的 RSS。
+#
+#   python bench/load_test.py --workers 1,2,4 --threads 1,4 --concurrency 16 --duration 20
+#   python bench/load_test.py --rate 200 --corpus jds.ndjson --out report.json
+
+import argparse
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from typing import Dict, List, Optional
+from urllib.parse import urlencode
+
+from corpus import SRC_DIR, load_corpus
+
+# -----------------------------
+# 1) gunicorn 进程管理
+# -----------------------------
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_ready(port: int, timeout_s: float = 30.0) -> None:
+    deadline = time.time() + timeout_s
+    while time.time() < deadline:
+        try:
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=2)
+            conn.request("GET", "/")
+            conn.getresponse().read()
+            conn.close()
+            return
+        except OSError:
+            time.sleep(0.2)
+    raise RuntimeError(f"server on port {port} did not become ready")
+
+
+def start_server(workers: int, threads: int, port: int, extra_env: Optional[Dict] = None,
+                 config: Optional[str] = None) -> subprocess.Popen:
+    cmd = [
+        sys.executable, "-m", "gunicorn",
+        "-w", str(workers), "--threads", str(threads),
+        "-b", f"127.0.0.1:{port}",
+        "--chdir", SRC_DIR,
+        "--log-level", "warning",
+    ]
+    if config:
+        cmd += ["-c", config]
+    cmd.append("web_app:app")
+    env = dict(os.environ, **(extra_env or {}))
+    proc = subprocess.Popen(cmd, env=env)
+    try:
+        _wait_ready(port)
+    except Exception:
+        proc.terminate()
+        raise
+    return proc
+
+
+def stop_server(proc: subprocess.Popen) -> None:
+    proc.terminate()
+    try:
+        proc.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        proc.kill()
+
+
+def _children(pid: int) -> List[int]:
+    try:
+        with open(f"/proc/{pid}/task/{pid}/children") as f:
+            return [int(x) for x in f.read().split()]
+    except OSError:
+        return []
+
+
+def rss_kb(pid: int) -> Optional[int]:
+    """
+    Resident set size from /proc (Linux). None elsewhere.
+    """
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1])
+    except OSError:
+        pass
+    return None
+
+
+def worker_rss(master_pid: int) -> List[Optional[int]]:
+    return [rss_kb(pid) for pid in _children(master_pid)]
+
+
+# -----------------------------
+# 2) 负载生成
+# -----------------------------
+class _Recorder:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies: List[float] = []
+        self.errors = 0
+        self.status: Dict[int, int] = {}
+
+    def add(self, latency_s: float, status: int) -> None:
+        with self.lock:
+            self.status[status] = self.status.get(status, 0) + 1
+            if status == 200:
+                self.latencies.append(latency_s)
+            else:
+                self.errors += 1
+
+
+def _client_loop(port: int, bodies: List[bytes], rec: _Recorder, stop_at: float,
+                 schedule: Optional[List[float]], seed: int) -> None:
+    rng = random.Random(seed)
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    headers = {"Content-Type": "application/x-www-form-urlencoded"}
+    while True:
+        if schedule is not None:
+            # 开环：按计划时间发，落后了就立刻发（延迟从计划时间算，避免 coordinated omission）
+            with rec.lock:
+                if not schedule:
+                    break
+                planned = schedule.pop()
+            if planned >= stop_at:
+                break
+            delay = planned - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            t0 = planned
+        else:
+            if time.perf_counter() >= stop_at:
+                break
+            t0 = time.perf_counter()
+
+        body = bodies[rng.randrange(len(bodies))]
+        try:
+            conn.request("POST", "/analyze", body=body, headers=headers)
+            resp = conn.getresponse()
+            resp.read()
+            status = resp.status
+        except (OSError, http.client.HTTPException):
+            status = 0
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        rec.add(time.perf_counter() - t0, status)
+    conn.close()
+
+
+def _percentile(sorted_vals: List[float], p: float) -> Optional[float]:
+    if not sorted_vals:
+        return None
+    i = min(len(sorted_vals) - 1, max(0, int(round(p / 100.0 * len(sorted_vals))) - 1))
+    return sorted_vals[i]
+
+
+def run_load(port: int, texts: List[str], concurrency: int, duration_s: float,
+             rate: float = 0.0, warmup_s: float = 2.0) -> Dict:
+    """
+    Closed loop (each client sends as fast as replies come back) when
+    rate == 0, otherwise open loop at `rate` requests/s spread over the
+    clients.
+    """
+    bodies = [urlencode({"mode": "text", "jd_text": t}).encode("utf-8") for t in texts]
+
+    if warmup_s > 0:
+        _client_loop(port, bodies, _Recorder(), time.perf_counter() + warmup_s, None, -1)
+
+    rec = _Recorder()
+    start = time.perf_counter()
+    stop_at = start + duration_s
+    schedule = None
+    if rate > 0:
+        n = int(rate * duration_s)
+        # pop() 从尾部取，所以倒序放
+        schedule = [start + i / rate for i in range(n)][::-1]
+
+    threads = [
+        threading.Thread(target=_client_loop, args=(port, bodies, rec, stop_at, schedule, i), daemon=True)
+        for i in range(concurrency)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - start
+
+    lat = sorted(rec.latencies)
+    total = len(lat) + rec.errors
+
+    def _ms(v: Optional[float]) -> Optional[float]:
+        return None if v is None else round(v * 1000, 2)
+
+    return {
+        "requests": total,
+        "ok": len(lat),
+        "errors": rec.errors,
+        "error_rate": round(rec.errors / total, 4) if total else 0.0,
+        "status_counts": rec.status,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(len(lat) / elapsed, 2) if elapsed > 0 else 0.0,
+        "p50_ms": _ms(_percentile(lat, 50)),
+        "p95_ms": _ms(_percentile(lat, 95)),
+        "p99_ms": _ms(_percentile(lat, 99)),
+        "max_ms": _ms(lat[-1] if lat else None),
+    }
+
+
+# -----------------------------
+# 3) sweep + 报告
+# -----------------------------
+def sweep(texts: List[str], workers_list: List[int], threads_list: List[int],
+          concurrency: int, duration_s: float, rate: float) -> List[Dict]:
+    results = []
+    for w in workers_list:
+        for th in threads_list:
+            port = _free_port()
+            proc = start_server(w, th, port)
+            try:
+                stats = run_load(port, texts, concurrency, duration_s, rate)
+                rss = worker_rss(proc.pid)
+            finally:
+                stop_server(proc)
+            known = [r for r in rss if r is not None]
+            stats.update({
+                "workers": w,
+                "threads": th,
+                "concurrency": concurrency,
+                "target_rate": rate or None,
+                "worker_rss_kb": rss,
+                "throughput_per_worker_rps": round(stats["throughput_rps"] / w, 2),
+                "mean_worker_rss_mb": round(sum(known) / len(known) / 1024, 1) if known else None,
+            })
+            results.append(stats)
+    return results
+
+
+def format_table(results: List[Dict]) -> str:
+    cols = [
+        ("workers", "W"), ("threads", "T"), ("throughput_rps", "rps"),
+        ("throughput_per_worker_rps", "rps/W"), ("p50_ms", "p50"), ("p95_ms", "p95"),
+        ("p99_ms", "p99"), ("error_rate", "err"), ("mean_worker_rss_mb", "RSS MB"),
+    ]
+    rows = [[h for _, h in cols]] + [[("-" if r[k] is None else str(r[k])) for k, _ in cols] for r in results]
+    widths = [max(len(row[i]) for row in rows) for i in range(len(cols))]
+    return "\n".join("  ".join(v.rjust(widths[i]) for i, v in enumerate(row)) for row in rows)
+
+
+def _int_list(s: str) -> List[int]:
+    return [int(x) for x in s.split(",") if x.strip()]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load-test web_app /analyze behind gunicorn.")
+    parser.add_argument("--corpus", help="NDJSON of JD texts; default: synthetic corpus")
+    parser.add_argument("--corpus-size", type=int, default=500)
+    parser.add_argument("--workers", default="1,2", help="comma-separated gunicorn worker counts")
+    parser.add_argument("--threads", default="1", help="comma-separated --threads values")
+    parser.add_argument("--concurrency", type=int, default=8, help="client connections")
+    parser.add_argument("--rate", type=float, default=0.0, help="requests/s (0 = closed loop)")
+    parser.add_argument("--duration", type=float, default=15.0, help="seconds per configuration")
+    parser.add_argument("--out", help="write JSON report here")
+    args = parser.parse_args()
+
+    texts = load_corpus(args.corpus, args.corpus_size)
+    results = sweep(texts, _int_list(args.workers), _int_list(args.threads),
+                    args.concurrency, args.duration, args.rate)
+
+    report = {"corpus_size": len(texts), "cpu_count": os.cpu_count(), "results": results}
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    print(format_table(results))
@@ -0,0 +1,116 @@
+# bench/shed_burst.py
+#
+# 突发流量下 /analyze 的降档是否真的发生：起 gunicorn，依次跑
+#   calm（低并发）-> burst（远超 worker 数的并发）-> calm
+# 统计每个阶段响应里的 analysis_level 分布和延迟分位数。
+# 同样的三段先在 JD_SHED_ENABLED=0（永远 full）下跑一遍，再开启降档跑一遍，
+# 对比 burst 阶段的 p99：开启后 full 占比应该明显下降、p99 更低，回到 calm 后又恢复成 full。
+#
+#   python bench/shed_burst.py --workers 2 --burst 32
+#   python bench/shed_burst.py --workers 2 --threads 4 --burst 64
+
+import argparse
+import http.client
+import json
+import threading
+import time
+from typing import Dict, List
+from urllib.parse import urlencode
+
+from corpus import load_corpus
+from load_test import _free_port, _percentile, start_server, stop_server
+
+
+def _client(port: int, bodies: List[bytes], stop_at: float, offset: int,
+            levels: Dict[str, int], latencies: List[float], lock: threading.Lock) -> None:
+    conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+    headers = {"Content-Type": "application/x-www-form-urlencoded"}
+    i = offset
+    while time.perf_counter() < stop_at:
+        t0 = time.perf_counter()
+        try:
+            conn.request("POST", "/analyze", body=bodies[i % len(bodies)], headers=headers)
+            resp = conn.getresponse()
+            data = resp.read()
+            level = json.loads(data).get("analysis_level", "?") if resp.status == 200 else f"http_{resp.status}"
+        except (OSError, http.client.HTTPException, ValueError):
+            level = "error"
+            conn.close()
+            conn = http.client.HTTPConnection("127.0.0.1", port, timeout=60)
+        ms = (time.perf_counter() - t0) * 1000
+        with lock:
+            levels[level] = levels.get(level, 0) + 1
+            latencies.append(ms)
+        i += 1
+    conn.close()
+
+
+def run_phase(port: int, bodies: List[bytes], name: str, concurrency: int, duration_s: float,
+              shedding: bool = True) -> Dict:
+    levels: Dict[str, int] = {}
+    latencies: List[float] = []
+    lock = threading.Lock()
+    stop_at = time.perf_counter() + duration_s
+    threads = [
+        threading.Thread(target=_client, args=(port, bodies, stop_at, k * 7, levels, latencies, lock), daemon=True)
+        for k in range(concurrency)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    lat = sorted(latencies)
+    total = len(lat)
+    return {
+        "shedding": "on" if shedding else "off",
+        "phase": name,
+        "concurrency": concurrency,
+        "requests": total,
+        "levels": levels,
+        "full_share": round(levels.get("full", 0) / total, 3) if total else None,
+        "p50_ms": round(_percentile(lat, 50), 2) if lat else None,
+        "p99_ms": round(_percentile(lat, 99), 2) if lat else None,
+    }
+
+
+def format_table(rows: List[Dict]) -> str:
+    cols = ["shedding", "phase", "concurrency", "requests", "full", "standard", "fast", "full_share", "p50_ms", "p99_ms"]
+    table = [cols]
+    for r in rows:
+        vals = dict(r, **{k: r["levels"].get(k, 0) for k in ("full", "standard", "fast")})
+        table.append(["-" if vals[c] is None else str(vals[c]) for c in cols])
+    widths = [max(len(row[i]) for row in table) for i in range(len(cols))]
+    return "\n".join("  ".join(v.rjust(widths[i]) for i, v in enumerate(row)) for row in table)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Check that /analyze sheds to cheaper levels under a burst.")
+    parser.add_argument("--corpus", help="NDJSON of JD texts; default: synthetic corpus")
+    parser.add_argument("--workers", type=int, default=2)
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--calm", type=int, default=1, help="client connections in the calm phases")
+    parser.add_argument("--burst", type=int, default=32, help="client connections in the burst phase")
+    parser.add_argument("--duration", type=float, default=8.0, help="seconds per phase")
+    parser.add_argument("--out", help="write JSON report here")
+    args = parser.parse_args()
+
+    texts = load_corpus(args.corpus, 300)
+    bodies = [urlencode({"mode": "text", "jd_text": t}).encode("utf-8") for t in texts]
+
+    rows = []
+    for shedding in (False, True):
+        port = _free_port()
+        proc = start_server(args.workers, args.threads, port,
+                            extra_env={"JD_SHED_ENABLED": "1" if shedding else "0"})
+        try:
+            for name, conc in (("calm", args.calm), ("burst", args.burst), ("calm", args.calm)):
+                rows.append(run_phase(port, bodies, name, conc, args.duration, shedding))
+        finally:
+            stop_server(proc)
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+    else:
+        print(json.dumps(rows, indent=2))
+    print(format_table(rows))
@@ -0,0 +1,129 @@
+# bench/startup_bench.py
+#
+# 对比 gunicorn 两种启动方式：
+#   cold - 每个 worker 自己 import app、建 analyzer 状态（bench/gunicorn_cold.conf.py）
+#   warm - master 预建 + gc.freeze，worker fork 后 copy-on-write 继承（gunicorn_warm.conf.py）
+# 报告：worker 启动耗时（fork -> ready）、整体就绪时间、压一段流量之后每个 worker 的 RSS / PSS / USS。
+# 共享页被写脏后会从 PSS/USS 上看出来；RSS 把共享页也算进去了，所以三个一起看。
+#
+#   python bench/startup_bench.py --workers 4
+
+import argparse
+import json
+import os
+import tempfile
+import time
+from typing import Dict, List, Optional
+
+from corpus import load_corpus
+from load_test import _children, _free_port, rss_kb, run_load, start_server, stop_server
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+CONFIGS = {
+    "cold": os.path.join(BENCH_DIR, "gunicorn_cold.conf.py"),
+    "warm": os.path.join(BENCH_DIR, "..", "gunicorn_warm.conf.py"),
+}
+
+
+def smaps_rollup_kb(pid: int) -> Dict[str, Optional[int]]:
+    """
+    PSS and USS (private clean + private dirty) from /proc (Linux >= 4.14).
+    """
+    out: Dict[str, int] = {}
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].endswith(":") and parts[1].isdigit():
+                    out[parts[0][:-1]] = int(parts[1])
+    except OSError:
+        return {"pss_kb": None, "uss_kb": None}
+    return {
+        "pss_kb": out.get("Pss"),
+        "uss_kb": out.get("Private_Clean", 0) + out.get("Private_Dirty", 0),
+    }
+
+
+def _wait_for_workers(log_path: str, n: int, timeout_s: float = 60.0) -> List[Dict]:
+    deadline = time.time() + timeout_s
+    while time.time() < deadline:
+        if os.path.exists(log_path):
+            with open(log_path, encoding="utf-8") as f:
+                rows = [json.loads(ln) for ln in f if ln.strip()]
+            if len(rows) >= n:
+                return rows
+        time.sleep(0.05)
+    raise RuntimeError("workers did not report ready")
+
+
+def _mb(kb: Optional[int]) -> Optional[float]:
+    return None if kb is None else round(kb / 1024, 1)
+
+
+def run_mode(mode: str, workers: int, texts: List[str], load_s: float) -> Dict:
+    fd, log_path = tempfile.mkstemp(prefix="jd-startup-", suffix=".ndjson")
+    os.close(fd)
+    os.remove(log_path)
+
+    port = _free_port()
+    t0 = time.perf_counter()
+    proc = start_server(workers, 1, port, extra_env={"JD_STARTUP_LOG": log_path}, config=CONFIGS[mode])
+    try:
+        ready = _wait_for_workers(log_path, workers)
+        ready_s = time.perf_counter() - t0
+        if load_s > 0:
+            run_load(port, texts, concurrency=workers * 2, duration_s=load_s, warmup_s=0)
+        pids = _children(proc.pid)
+        per_worker = []
+        for pid in pids:
+            mem = smaps_rollup_kb(pid)
+            per_worker.append({"pid": pid, "rss_kb": rss_kb(pid), **mem})
+        master_rss = rss_kb(proc.pid)
+    finally:
+        stop_server(proc)
+        if os.path.exists(log_path):
+            os.remove(log_path)
+
+    def _mean(key: str) -> Optional[float]:
+        vals = [w[key] for w in per_worker if w[key] is not None]
+        return _mb(sum(vals) / len(vals)) if vals else None
+
+    init_ms = sorted(r["init_ms"] for r in ready)
+    return {
+        "mode": mode,
+        "workers": workers,
+        "all_ready_s": round(ready_s, 3),
+        "worker_init_ms_median": init_ms[len(init_ms) // 2],
+        "worker_init_ms_max": init_ms[-1],
+        "master_rss_mb": _mb(master_rss),
+        "worker_rss_mb": _mean("rss_kb"),
+        "worker_pss_mb": _mean("pss_kb"),
+        "worker_uss_mb": _mean("uss_kb"),
+        "per_worker": per_worker,
+    }
+
+
+def format_table(rows: List[Dict]) -> str:
+    cols = ["mode", "workers", "all_ready_s", "worker_init_ms_median", "worker_rss_mb",
+            "worker_pss_mb", "worker_uss_mb", "master_rss_mb"]
+    table = [cols] + [["-" if r[c] is None else str(r[c]) for c in cols] for r in rows]
+    widths = [max(len(row[i]) for row in table) for i in range(len(cols))]
+    return "\n".join("  ".join(v.rjust(widths[i]) for i, v in enumerate(row)) for row in table)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Cold vs warm-start gunicorn startup benchmark.")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--load", type=float, default=5.0, help="seconds of traffic before measuring memory")
+    parser.add_argument("--out", help="write JSON report here")
+    args = parser.parse_args()
+
+    texts = load_corpus(None, 200)
+    rows = [run_mode(mode, args.workers, texts, args.load) for mode in ("cold", "warm")]
+
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(rows, f, indent=2)
+    else:
+        print(json.dumps(rows, indent=2))
+    print(format_table(rows))
@@ -0,0 +1,118 @@
+# bench/thread_scaling.py
+#
+# analyze_jd_text 吞吐：同一进程 1..N 个线程 vs N 个进程（process-per-worker）。
+# 同时报告内存：线程模式是本进程 RSS，进程模式是所有 worker RSS 之和，再除以并发数。
+# 在 free-threaded CPython（python3.13t 等）上跑才能看到线程真正并行。
+#
+#   python bench/thread_scaling.py --max 8 --duration 5
+
+import argparse
+import json
+import multiprocessing as mp
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+from corpus import load_corpus
+from load_test import rss_kb
+from text_analyzer import analyze_jd_text
+
+
+def _loop(texts: List[str], stop_at: float, offset: int) -> int:
+    n = 0
+    i = offset
+    while time.perf_counter() < stop_at:
+        analyze_jd_text(texts[i % len(texts)])
+        i += 1
+        n += 1
+    return n
+
+
+def run_threads(texts: List[str], n: int, duration_s: float) -> Dict:
+    start_barrier = threading.Barrier(n + 1)
+    results: List[int] = [0] * n
+
+    def _worker(k: int) -> None:
+        start_barrier.wait()
+        results[k] = _loop(texts, stop_at, k * 7)
+
+    stop_at = float("inf")
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        futures = [pool.submit(_worker, k) for k in range(n)]
+        stop_at = time.perf_counter() + duration_s
+        start_barrier.wait()
+        for f in futures:
+            f.result()
+        rss = rss_kb(os.getpid())
+    total = sum(results)
+    return {
+        "mode": "threads",
+        "concurrency": n,
+        "items_per_s": round(total / duration_s, 1),
+        "rss_mb": round(rss / 1024, 1) if rss else None,
+        "rss_per_concurrent_mb": round(rss / 1024 / n, 1) if rss else None,
+    }
+
+
+def _proc_worker(args) -> Dict:
+    texts, duration_s, k = args
+    count = _loop(texts, time.perf_counter() + duration_s, k * 7)
+    return {"count": count, "rss_kb": rss_kb(os.getpid())}
+
+
+def run_processes(texts: List[str], n: int, duration_s: float) -> Dict:
+    # 每个 worker 自己 import analyzer，和 gunicorn 的 process-per-worker 一样各有一份
+    with mp.get_context("spawn").Pool(n) as pool:
+        out = pool.map(_proc_worker, [(texts, duration_s, k) for k in range(n)])
+    total = sum(o["count"] for o in out)
+    rss = [o["rss_kb"] for o in out if o["rss_kb"]]
+    return {
+        "mode": "processes",
+        "concurrency": n,
+        "items_per_s": round(total / duration_s, 1),
+        "rss_mb": round(sum(rss) / 1024, 1) if rss else None,
+        "rss_per_concurrent_mb": round(sum(rss) / 1024 / n, 1) if rss else None,
+    }
+
+
+def format_table(rows: List[Dict]) -> str:
+    cols = ["mode", "concurrency", "items_per_s", "rss_mb", "rss_per_concurrent_mb"]
+    table = [cols] + [["-" if r[c] is None else str(r[c]) for c in cols] for r in rows]
+    widths = [max(len(row[i]) for row in table) for i in range(len(cols))]
+    return "\n".join("  ".join(v.rjust(widths[i]) for i, v in enumerate(row)) for row in table)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Thread vs process scaling of analyze_jd_text.")
+    parser.add_argument("--corpus", help="NDJSON of JD texts; default: synthetic corpus")
+    parser.add_argument("--max", type=int, default=os.cpu_count() or 4, help="max concurrency")
+    parser.add_argument("--duration", type=float, default=5.0, help="seconds per run")
+    parser.add_argument("--no-processes", action="store_true")
+    parser.add_argument("--out", help="write JSON report here")
+    args = parser.parse_args()
+
+    texts = load_corpus(args.corpus, 300)
+    levels = sorted({1, 2, 4, 8, 16, args.max} & set(range(1, args.max + 1)))
+    # 预热一遍（解释器特化、分配器等），别把冷启动算进 1 线程的结果
+    for t in texts:
+        analyze_jd_text(t)
+
+    rows = [run_threads(texts, n, args.duration) for n in levels]
+    if not args.no_processes:
+        rows += [run_processes(texts, n, args.duration) for n in levels]
+
+    report = {
+        "python": sys.version.split()[0],
+        "gil_enabled": getattr(sys, "_is_gil_enabled", lambda: True)(),
+        "cpu_count": os.cpu_count(),
+        "results": rows,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    print(format_table(rows))
@@ -0,0 +1,39 @@
+# gunicorn_warm.conf.py
+#
+# Warm-start mode: the master builds all analyzer state once, freezes it
+# away from the GC, and workers inherit it copy-on-write after fork.
+#
+#   gunicorn -c gunicorn_warm.conf.py --chdir src web_app:app
+
+import gc
+import os
+import sys
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "src")
+if SRC_DIR not in sys.path:
+    sys.path.insert(0, SRC_DIR)
+
+import warm_start  # noqa: E402
+
+preload_app = True
+
+# master 在 fork 前不跑 GC：否则 GC 会改对象头，把刚建好的共享状态写脏
+gc.disable()
+
+
+def on_starting(server):
+    timings = warm_start.build_analyzer_state()
+    server.log.info("warm start: analyzer state built in %.1f ms", sum(timings.values()))
+
+
+def pre_fork(server, worker):
+    warm_start.freeze_shared_state()
+
+
+def post_fork(server, worker):
+    warm_start.record_fork(worker)
+    gc.enable()
+
+
+def post_worker_init(worker):
+    warm_start.record_ready(worker)
@@ -0,0 +1,144 @@
+# src/batch_analyzer.py
+
+import json
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterable, Iterator, Optional, Tuple
+
+from run import analyze_jd
+
+# 批量请求共用一个小线程池：池子大小就是所有 batch 加起来的并发上限，
+# 普通 /analyze 在请求线程里直接跑，不会排在 batch 后面
+BATCH_WORKERS = int(os.environ.get("JD_BATCH_WORKERS", "2"))
+# 单个 batch 最多同时提交多少条；读输入也会停在这里（背压）
+MAX_IN_FLIGHT = int(os.environ.get("JD_BATCH_MAX_IN_FLIGHT", "8"))
+MAX_ITEMS = int(os.environ.get("JD_BATCH_MAX_ITEMS", "5000"))
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=BATCH_WORKERS, thread_name_prefix="jd-batch")
+        return _pool
+
+
+# -----------------------------
+# 1) 输入解析
+# -----------------------------
+def parse_item(index: int, obj: Any) -> Tuple[int, Any, str]:
+    """
+    Accept either a plain string or {"id": ..., "jd_text": ...}.
+    Returns (index, id, jd_text); raises ValueError for bad items.
+    """
+    if isinstance(obj, str):
+        return index, None, obj
+    if isinstance(obj, dict):
+        text = obj.get("jd_text")
+        if not isinstance(text, str):
+            raise ValueError("item must have a string 'jd_text'")
+        return index, obj.get("id"), text
+    raise ValueError("item must be a string or an object with 'jd_text'")
+
+
+def iter_json_array(data: bytes) -> Iterator[Any]:
+    arr = json.loads(data or b"[]")
+    if not isinstance(arr, list):
+        raise ValueError("expected a JSON array")
+    return iter(arr)
+
+
+def iter_ndjson(lines: Iterable[bytes]) -> Iterator[Any]:
+    """
+    Lazily decode NDJSON lines; a bad line is yielded as an exception
+    object so it becomes a per-item error instead of killing the batch.
+    """
+    for raw in lines:
+        line = raw.strip()
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as e:
+            yield e
+
+
+# -----------------------------
+# 2) 并发执行 + 流式输出
+# -----------------------------
+def _error_line(index: int, item_id: Any, msg: str) -> str:
+    return json.dumps({"index": index, "id": item_id, "error": msg}, ensure_ascii=False) + "\n"
+
+
+def stream_batch(objs: Iterable[Any], max_in_flight: int = MAX_IN_FLIGHT) -> Iterator[str]:
+    """
+    Analyze items and yield one NDJSON line per item as it finishes
+    (completion order, not input order — each line carries its index).
+    The last line is {"_stats": {...}}.
+    """
+    pool = _get_pool()
+    started = time.perf_counter()
+    in_flight: Dict[Future, Tuple[int, Any]] = {}
+    ok = errors = total = 0
+
+    def _drain(block_until_one: bool) -> Iterator[str]:
+        nonlocal ok, errors
+        if not in_flight:
+            return
+        done, _ = wait(list(in_flight), timeout=None if block_until_one else 0,
+                       return_when=FIRST_COMPLETED)
+        for fut in done:
+            index, item_id = in_flight.pop(fut)
+            try:
+                result = fut.result()
+            except Exception as e:
+                errors += 1
+                yield _error_line(index, item_id, str(e) or "Failed to analyze.")
+                continue
+            ok += 1
+            yield json.dumps({"index": index, "id": item_id, "result": result}, ensure_ascii=False) + "\n"
+
+    for index, obj in enumerate(objs):
+        total += 1
+        if total > MAX_ITEMS:
+            errors += 1
+            yield _error_line(index, None, f"batch exceeds {MAX_ITEMS} items; rest ignored")
+            break
+        if isinstance(obj, Exception):
+            errors += 1
+            yield _error_line(index, None, f"invalid JSON: {obj}")
+            continue
+        try:
+            _, item_id, text = parse_item(index, obj)
+        except ValueError as e:
+            errors += 1
+            yield _error_line(index, obj.get("id") if isinstance(obj, dict) else None, str(e))
+            continue
+        if not text.strip():
+            errors += 1
+            yield _error_line(index, item_id, "JD text is empty.")
+            continue
+
+        # 在途满了就先等一个完成，再读下一条
+        while len(in_flight) >= max_in_flight:
+            yield from _drain(block_until_one=True)
+        in_flight[pool.submit(analyze_jd, text)] = (index, item_id)
+        # 顺手把已经完成的先吐出去
+        yield from _drain(block_until_one=False)
+
+    while in_flight:
+        yield from _drain(block_until_one=True)
+
+    elapsed = time.perf_counter() - started
+    yield json.dumps({"_stats": {
+        "items": ok + errors,
+        "ok": ok,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 4),
+        "items_per_s": round(ok / elapsed, 2) if elapsed > 0 else None,
+    }}) + "\n"
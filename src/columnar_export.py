@@ -0,0 +1,288 @@
+# src/columnar_export.py
+
+import argparse
+import json
+import os
+import time
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+
+# analyze_jd_text 结果批量导出成 Arrow IPC 文件（Feather v2）：
+#   - company / seniority / job_title：dictionary 编码（相当于 categorical）
+#   - skills / fields / keywords / education：list<dictionary>
+#   - responsibilities / summary 几乎每行都不一样，字典没意义，直接存字符串
+#   - 按 chunk_rows 分批写 record batch；字典跨批只增不减，写成 dictionary delta，
+#     每次 flush 只把新增的值转成 Arrow
+#   - 每个字典最多 max_dict_values 个值：满了就另起一个分片文件（字典从头开始），
+#     所以内存上限是“一批 + 每列一个封顶的字典”，和导出总行数无关
+#   - 读的时候 memory_map 零拷贝，分片按顺序拼起来
+
+_DICT = pa.dictionary(pa.int32(), pa.string())
+
+CATEGORICAL_COLUMNS = ["company", "seniority", "job_title"]
+LIST_COLUMNS = [
+    "required_skills", "preferred_skills", "fields", "keywords",
+    "education_required", "education_preferred",
+]
+TEXT_LIST_COLUMNS = ["responsibilities"]
+
+SCHEMA = pa.schema(
+    [pa.field("id", pa.int64())]
+    + [pa.field(c, _DICT) for c in CATEGORICAL_COLUMNS]
+    + [pa.field(c, pa.list_(_DICT)) for c in LIST_COLUMNS]
+    + [pa.field(c, pa.list_(pa.string())) for c in TEXT_LIST_COLUMNS]
+    + [pa.field("summary", pa.string())]
+)
+
+DEFAULT_CHUNK_ROWS = 50_000
+DEFAULT_MAX_DICT_VALUES = 100_000
+
+
+def _row_values(result: Dict) -> Dict[str, object]:
+    edu = result.get("education") or {}
+    return {
+        "company": result.get("company") or "",
+        "seniority": result.get("seniority") or "",
+        "job_title": result.get("job_title") or "",
+        "required_skills": result.get("required_skills") or [],
+        "preferred_skills": result.get("preferred_skills") or [],
+        "responsibilities": result.get("responsibilities") or [],
+        "fields": result.get("fields") or [],
+        "keywords": result.get("keywords") or [],
+        "education_required": edu.get("required") or [],
+        "education_preferred": edu.get("preferred") or [],
+    }
+
+
+def part_path(path: str, part: int) -> str:
+    """
+    File name of shard `part` of an export: part 0 is `path` itself,
+    later parts are "<stem>.part<N><ext>".
+    """
+    if part == 0:
+        return path
+    root, ext = os.path.splitext(path)
+    return f"{root}.part{part}{ext}"
+
+
+class _GrowingDictionary:
+    """
+    Value -> code mapping shared by all batches of one column (within one
+    part file). Codes never change once assigned, so each batch's
+    dictionary is a prefix-extension of the previous one and the writer
+    only emits the new values.
+    """
+
+    def __init__(self):
+        self.codes: Dict[str, int] = {}
+        self.pending: List[str] = []       # 上次 flush 之后新加的值
+        self.values = pa.array([], type=pa.string())
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+    def code(self, v: str) -> int:
+        c = self.codes.get(v)
+        if c is None:
+            c = len(self.codes)
+            self.codes[v] = c
+            self.pending.append(v)
+        return c
+
+    def encode(self, codes: List[int]) -> pa.DictionaryArray:
+        if self.pending:
+            # 只转换新增部分；拼接是 Arrow 里的一次 memcpy，大小受 max_dict_values 限制
+            self.values = pa.concat_arrays([self.values, pa.array(self.pending, type=pa.string())])
+            self.pending = []
+        return pa.DictionaryArray.from_arrays(pa.array(codes, type=pa.int32()), self.values)
+
+
+class ColumnarExporter:
+    """
+    Streaming writer:
+
+        with ColumnarExporter("postings.arrow") as ex:
+            for posting_id, result in ...:
+                ex.add(result, posting_id)
+
+    Writes `path`, plus "<stem>.partN<ext>" files whenever a column's
+    dictionary reaches max_dict_values; `ex.paths` lists them in order.
+    """
+
+    def __init__(self, path: str, chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                 max_dict_values: int = DEFAULT_MAX_DICT_VALUES):
+        self.path = path
+        self.chunk_rows = chunk_rows
+        self.max_dict_values = max_dict_values
+        self.rows_written = 0
+        self.paths: List[str] = []
+        self._writer = None
+        self._dicts = {c: _GrowingDictionary() for c in CATEGORICAL_COLUMNS + LIST_COLUMNS}
+        self._reset()
+
+    def _open_part(self) -> None:
+        if not self.paths:
+            # 同名导出留下的旧分片会被 read_export 一起读进来，开第一个分片前先清掉
+            part = 1
+            while os.path.exists(part_path(self.path, part)):
+                os.remove(part_path(self.path, part))
+                part += 1
+        self.paths.append(part_path(self.path, len(self.paths)))
+        self._writer = ipc.new_file(
+            self.paths[-1], SCHEMA, options=ipc.IpcWriteOptions(emit_dictionary_deltas=True)
+        )
+
+    def _reset(self) -> None:
+        self._ids: List[Optional[int]] = []
+        self._summary: List[str] = []
+        self._codes: Dict[str, List[int]] = {c: [] for c in CATEGORICAL_COLUMNS + LIST_COLUMNS}
+        self._offsets: Dict[str, List[int]] = {c: [0] for c in LIST_COLUMNS + TEXT_LIST_COLUMNS}
+        self._texts: Dict[str, List[str]] = {c: [] for c in TEXT_LIST_COLUMNS}
+
+    def add(self, result: Dict, posting_id: Optional[int] = None) -> None:
+        vals = _row_values(result)
+        self._ids.append(posting_id)
+        self._summary.append(result.get("summary") or "")
+        for c in CATEGORICAL_COLUMNS:
+            self._codes[c].append(self._dicts[c].code(vals[c]))
+        for c in LIST_COLUMNS:
+            d, codes = self._dicts[c], self._codes[c]
+            for v in vals[c]:
+                codes.append(d.code(v))
+            self._offsets[c].append(len(codes))
+        for c in TEXT_LIST_COLUMNS:
+            texts = self._texts[c]
+            texts.extend(vals[c])
+            self._offsets[c].append(len(texts))
+        if len(self._ids) >= self.chunk_rows or any(
+                len(d) >= self.max_dict_values for d in self._dicts.values()):
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._ids:
+            return
+        columns = [pa.array(self._ids, type=pa.int64())]
+        for c in CATEGORICAL_COLUMNS:
+            columns.append(self._dicts[c].encode(self._codes[c]))
+        for c in LIST_COLUMNS:
+            columns.append(pa.ListArray.from_arrays(
+                pa.array(self._offsets[c], type=pa.int32()), self._dicts[c].encode(self._codes[c])
+            ))
+        for c in TEXT_LIST_COLUMNS:
+            columns.append(pa.ListArray.from_arrays(
+                pa.array(self._offsets[c], type=pa.int32()), pa.array(self._texts[c], type=pa.string())
+            ))
+        columns.append(pa.array(self._summary, type=pa.string()))
+
+        if self._writer is None:
+            self._open_part()
+        self._writer.write_batch(pa.record_batch(columns, schema=SCHEMA))
+        self.rows_written += len(self._ids)
+        self._reset()
+        if any(len(d) >= self.max_dict_values for d in self._dicts.values()):
+            # 字典封顶：这个分片写完，下一批进新文件，字典从空开始
+            self._writer.close()
+            self._writer = None
+            self._dicts = {c: _GrowingDictionary() for c in CATEGORICAL_COLUMNS + LIST_COLUMNS}
+
+    def close(self) -> None:
+        self.flush()
+        if self._writer is None and not self.paths:
+            # 一行都没有也留一个只有 schema 的文件
+            self._open_part()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def __enter__(self) -> "ColumnarExporter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def export_results(items: Iterable[Tuple[Optional[int], Dict]], path: str,
+                   chunk_rows: int = DEFAULT_CHUNK_ROWS,
+                   max_dict_values: int = DEFAULT_MAX_DICT_VALUES) -> int:
+    with ColumnarExporter(path, chunk_rows, max_dict_values) as ex:
+        for posting_id, result in items:
+            ex.add(result, posting_id)
+    return ex.rows_written
+
+
+def read_export(path: str) -> pa.Table:
+    """
+    Memory-map an export (all of its part files); column buffers point
+    into the mapped files instead of being copied onto the heap.
+    """
+    tables = []
+    part = 0
+    while part == 0 or os.path.exists(part_path(path, part)):
+        tables.append(ipc.open_file(pa.memory_map(part_path(path, part), "r")).read_all())
+        part += 1
+    return tables[0] if len(tables) == 1 else pa.concat_tables(tables)
+
+
+def skill_counts(table: pa.Table, column: str = "required_skills", top: int = 20) -> List[Tuple[str, int]]:
+    """
+    Example aggregate: most common skills across the export.
+    """
+    flat = pc.list_flatten(table.column(column))
+    if len(flat) == 0:
+        return []
+    # 各分片的字典不同，先按块转成 string 再统计
+    vc = pc.value_counts(flat.cast(pa.string()))
+    pairs = sorted(zip(vc.field("values").to_pylist(), vc.field("counts").to_pylist()),
+                   key=lambda x: -x[1])
+    return pairs[:top]
+
+
+# -----------------------------
+# 数据来源：jd_store 或 ingest_dump 的输出
+# -----------------------------
+def iter_store(db_path: str) -> Iterator[Tuple[Optional[int], Dict]]:
+    from jd_store import connect
+    conn = connect(db_path)
+    for row in conn.execute("SELECT id, result_json FROM postings ORDER BY id"):
+        yield row["id"], json.loads(row["result_json"])
+
+
+def iter_results_ndjson(path: str) -> Iterator[Tuple[Optional[int], Dict]]:
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            obj = json.loads(line)
+            if "result" in obj:
+                item_id = obj.get("id")
+                yield (item_id if isinstance(item_id, int) else None), obj["result"]
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export analyzed postings to an Arrow IPC file.")
+    src = parser.add_mutually_exclusive_group(required=True)
+    src.add_argument("--db", help="jd_store SQLite file")
+    src.add_argument("--ndjson", help="ingest_dump / batch NDJSON output")
+    src.add_argument("--read", help="read an existing export and print top skills")
+    parser.add_argument("--out", help="output .arrow path")
+    parser.add_argument("--chunk-rows", type=int, default=DEFAULT_CHUNK_ROWS)
+    parser.add_argument("--max-dict-values", type=int, default=DEFAULT_MAX_DICT_VALUES,
+                        help="start a new part file when a column dictionary reaches this size")
+    args = parser.parse_args()
+
+    if args.read:
+        t0 = time.perf_counter()
+        table = read_export(args.read)
+        top = skill_counts(table)
+        print(json.dumps({"rows": table.num_rows, "top_required_skills": top,
+                          "elapsed_s": round(time.perf_counter() - t0, 3)}, indent=2))
+    else:
+        if not args.out:
+            parser.error("--out is required when exporting")
+        items = iter_store(args.db) if args.db else iter_results_ndjson(args.ndjson)
+        n = export_results(items, args.out, args.chunk_rows, args.max_dict_values)
+        print(f"exported {n} postings -> {args.out}")
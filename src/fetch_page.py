@@ -1,5 +1,7 @@
 # src/fetch_page.py
 
+from typing import Optional, Tuple
+
 from playwright.sync_api import sync_playwright
 from html_extractor import extract_job_page_inputs
 
@@ -12,17 +14,25 @@ def fetch_rendered_html(url: str, headless: bool = True) -> str:
     - Always headless=True in web applications
     - Never open a real browser window from Flask
     """
+    return fetch_rendered_page(url, headless=headless)[0]
+
+
+def fetch_rendered_page(url: str, headless: bool = True) -> Tuple[str, Optional[int]]:
+    """
+    Same as fetch_rendered_html, but also returns the HTTP status of the
+    main document (None if the navigation had no response).
+    """
 
     with sync_playwright() as p:
         browser = p.chromium.launch(headless=headless)
         context = browser.new_context()
         page = context.new_page()
 
-        page.goto(url, wait_until="networkidle", timeout=60000)
+        response = page.goto(url, wait_until="networkidle", timeout=60000)
         page.wait_for_timeout(3000)
 
         html = page.content()
 
         browser.close()
-        return html
+        return html, (response.status if response is not None else None)
 
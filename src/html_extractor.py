@@ -1,23 +1,25 @@
 # src/html_extractor.py
 
-from bs4 import BeautifulSoup
 import re
 
+from html_preprocessor import scan_job_page
+
 def extract_job_page_inputs(html: str) -> dict:
-    soup = BeautifulSoup(html, "lxml")
+    # 流式预处理：不建整棵 DOM，只拿 title / canonical / 最大内容区文本
+    page = scan_job_page(html)
 
     # ---------- 1) job_title ----------
     job_title = ""
 
     # 优先从 <title> 里拿（LinkedIn / 官网都稳）
-    if soup.title and soup.title.text:
-        title_text = soup.title.text.strip()
+    if page["title"]:
+        title_text = page["title"]
         # 常见格式： "Data Engineering Intern - Netflix | LinkedIn"
         # ---------- job_title (robust) ----------
         job_title = ""
 
-        if soup.title and soup.title.text:
-            title_text = soup.title.text.strip()
+        if page["title"]:
+            title_text = page["title"]
 
             # 去掉 LinkedIn / 领英后缀
             title_text = re.split(r"\||｜", title_text)[0]
@@ -34,31 +36,21 @@ def extract_job_page_inputs(html: str) -> dict:
     company = ""
 
     # LinkedIn 常见：canonical URL 含 company
-    canonical = soup.find("link", rel="canonical")
-    if canonical and canonical.get("href"):
-        href = canonical["href"]
+    if page["canonical"]:
+        href = page["canonical"]
         # 例： data-engineering-intern-summer-2026-at-netflix-4348163604
         m = re.search(r"-at-([a-zA-Z0-9\-]+)-\d+", href)
         if m:
             company = m.group(1).replace("-", " ").title()
 
     # 兜底：从 title 中猜公司
-    if not company and soup.title:
-        if " at " in soup.title.text:
-            company = soup.title.text.split(" at ")[-1].split("|")[0].strip()
+    if not company and page["title"]:
+        if " at " in page["title"]:
+            company = page["title"].split(" at ")[-1].split("|")[0].strip()
 
     # ---------- 3) jd_text（内部用） ----------
-    # 策略：取页面中“可见文本最多的区域”
-    jd_text = ""
-
-    candidates = soup.find_all(["section", "div"], recursive=True)
-    best_text = ""
-    for tag in candidates:
-        text = tag.get_text(separator=" ", strip=True)
-        if len(text) > len(best_text):
-            best_text = text
-
-    jd_text = best_text
+    # 策略：取页面中“可见文本最多的区域”（scan_job_page 里边解析边算好了）
+    jd_text = page["content_text"]
 
     return {
         "job_title": job_title,
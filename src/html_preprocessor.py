@@ -0,0 +1,144 @@
+# src/html_preprocessor.py
+
+import re
+from typing import Dict, List, Optional
+
+from lxml import etree
+
+# 渲染后的 LinkedIn 页面里大部分字节是 <script>（内联 JSON）、<style>、<svg>，
+# 以前整页先变成 BeautifulSoup 树再扔掉。这里用 lxml 的 target 解析器做事件流：
+# 不建树，遇到非内容元素直接跳过整棵子树，只留下 title / canonical / 各 section|div 的可见文本。
+
+SKIP_TAGS = {"script", "style", "noscript", "svg", "template", "iframe", "canvas", "object", "math"}
+CANDIDATE_TAGS = {"section", "div"}
+
+_DISPLAY_NONE = re.compile(r"display\s*:\s*none|visibility\s*:\s*hidden", re.IGNORECASE)
+# 分块喂给解析器，避免一次性把整页转成一份 bytes 副本
+FEED_CHUNK = 1 << 16
+
+
+def _is_hidden(attrib) -> bool:
+    # aria-hidden 只对读屏软件隐藏，页面上照样显示（装饰图标、重复的标题等），不能当作不可见
+    if "hidden" in attrib:
+        return True
+    style = attrib.get("style")
+    return bool(style and _DISPLAY_NONE.search(style))
+
+
+class _JobPageTarget:
+    """
+    lxml parser target. Text pieces are kept once in `pieces`; each
+    section/div only remembers the [start, end) slice of pieces it covered,
+    so nested candidates don't duplicate text.
+
+    lxml reports entity / character references (&amp; &#39; ...) as separate
+    `data` events, so consecutive events are buffered into one text node and
+    only flushed (stripped, counted) at the next element boundary -- the same
+    node boundaries BeautifulSoup's get_text(" ", strip=True) sees.
+    """
+
+    def __init__(self):
+        self.skip_depth = 0
+        self.in_title = False
+        self.title_parts: List[str] = []
+        self.title_done = False
+        self.canonical: Optional[str] = None
+
+        self.pending: List[str] = []   # 当前文本节点还没 flush 的 data 片段
+        self.pieces: List[str] = []
+        self.prefix_len = [0]          # prefix_len[i] = 文本长度之和（前 i 个 piece）
+        self.open_candidates: List[Optional[int]] = []
+        self.best_len = -1
+        self.best_span = (0, 0)
+
+    def _flush(self) -> None:
+        if not self.pending:
+            return
+        s = "".join(self.pending).strip()
+        self.pending.clear()
+        if s:
+            self.pieces.append(s)
+            self.prefix_len.append(self.prefix_len[-1] + len(s))
+
+    # --- events ---
+    def start(self, tag, attrib):
+        tag = tag.lower() if isinstance(tag, str) else ""
+        self._flush()
+        if self.skip_depth:
+            self.skip_depth += 1
+            return
+        if tag in SKIP_TAGS or _is_hidden(attrib):
+            self.skip_depth = 1
+            return
+
+        if tag == "title" and not self.title_done:
+            self.in_title = True
+        elif tag == "link" and self.canonical is None:
+            rel = (attrib.get("rel") or "").lower().split()
+            if "canonical" in rel and attrib.get("href"):
+                self.canonical = attrib.get("href")
+
+        self.open_candidates.append(len(self.pieces) if tag in CANDIDATE_TAGS else None)
+
+    def end(self, tag):
+        self._flush()
+        if self.skip_depth:
+            self.skip_depth -= 1
+            return
+        tag = tag.lower() if isinstance(tag, str) else ""
+        if tag == "title" and self.in_title:
+            self.in_title = False
+            self.title_done = True
+
+        start = self.open_candidates.pop() if self.open_candidates else None
+        if start is None:
+            return
+        n = len(self.pieces) - start
+        if n <= 0:
+            return
+        # 与 get_text(separator=" ", strip=True) 等长：各段长度 + 中间的空格
+        length = self.prefix_len[-1] - self.prefix_len[start] + (n - 1)
+        if length > self.best_len:
+            self.best_len = length
+            self.best_span = (start, len(self.pieces))
+
+    def data(self, text):
+        if self.skip_depth:
+            return
+        if self.in_title:
+            self.title_parts.append(text)
+            return
+        self.pending.append(text)
+
+    def comment(self, text):
+        # 注释也是节点边界：a<!-- x -->b 在 soup 里是两段文本
+        self._flush()
+
+    def close(self) -> Dict[str, str]:
+        self._flush()
+        start, end = self.best_span
+        return {
+            "title": "".join(self.title_parts).strip(),
+            "canonical": self.canonical or "",
+            "content_text": " ".join(self.pieces[start:end]),
+        }
+
+
+def scan_job_page(html: str) -> Dict[str, str]:
+    """
+    One streaming pass over rendered HTML. Returns
+      {"title": ..., "canonical": ..., "content_text": ...}
+    where content_text is the visible text of the section/div with the most
+    text (same rule html_extractor used on the full soup), with scripts,
+    styles, SVG and hidden nodes dropped during parsing.
+    """
+    target = _JobPageTarget()
+    html = html or ""
+    if not html.strip():
+        # 空文档 lxml 会报 "no element found"
+        return target.close()
+
+    parser = etree.HTMLParser(target=target, no_network=True)
+    for i in range(0, len(html), FEED_CHUNK):
+        parser.feed(html[i:i + FEED_CHUNK])
+    return parser.close()
@@ -0,0 +1,128 @@
+# src/ingest_dump.py
+
+import argparse
+import json
+import mmap
+import os
+import shutil
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+from batch_analyzer import parse_item
+from run import analyze_jd
+
+# 大文件（NDJSON，一行一条 JD）并行分析：
+#   主进程只负责按字节切分（切点对齐到换行），不读内容；
+#   每个 worker 自己 mmap 同一个文件，只处理自己那段 [start, end)，
+#   所以进程间只传 (path, start, end, out_path)，原文从不 pickle。
+#   每个分片写自己的输出文件，最后按顺序拼起来。
+
+
+def plan_shards(path: str, n_shards: int) -> List[Tuple[int, int]]:
+    """
+    Split `path` into at most `n_shards` byte ranges, each starting at the
+    beginning of a line and ending just after a newline (or at EOF).
+    """
+    size = os.path.getsize(path)
+    if size == 0:
+        return []
+    n_shards = max(1, min(n_shards, size))
+
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        bounds = [0]
+        for i in range(1, n_shards):
+            target = max(bounds[-1], size * i // n_shards)
+            nl = mm.find(b"\n", target)
+            if nl == -1:
+                break
+            cut = nl + 1
+            if cut > bounds[-1] and cut < size:
+                bounds.append(cut)
+        bounds.append(size)
+
+    return [(bounds[i], bounds[i + 1]) for i in range(len(bounds) - 1)]
+
+
+def _analyze_shard(path: str, start: int, end: int, out_path: str) -> Dict[str, int]:
+    ok = errors = 0
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm, \
+            open(out_path, "w", encoding="utf-8") as out:
+        pos = start
+        while pos < end:
+            nl = mm.find(b"\n", pos, end)
+            line_end = end if nl == -1 else nl
+            offset = pos
+            raw = mm[pos:line_end]
+            pos = line_end + 1
+
+            if not raw.strip():
+                continue
+            try:
+                _, item_id, text = parse_item(offset, json.loads(raw))
+                result = analyze_jd(text)
+            except Exception as e:
+                errors += 1
+                out.write(json.dumps({"offset": offset, "error": str(e) or "Failed to analyze."},
+                                     ensure_ascii=False) + "\n")
+                continue
+            ok += 1
+            out.write(json.dumps({"offset": offset, "id": item_id, "result": result},
+                                 ensure_ascii=False) + "\n")
+    return {"ok": ok, "errors": errors}
+
+
+def ingest_file(path: str, out_path: str, workers: int = 0, shards_per_worker: int = 4) -> Dict:
+    """
+    Analyze every record in an NDJSON dump in parallel and write one NDJSON
+    result line per record to `out_path` (input order is preserved).
+    More shards than workers keeps all cores busy when shards are uneven.
+    """
+    workers = workers or os.cpu_count() or 1
+    shards = plan_shards(path, workers * shards_per_worker)
+    shard_paths = [f"{out_path}.part{i:05d}" for i in range(len(shards))]
+
+    started = time.perf_counter()
+    ok = errors = 0
+    try:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(_analyze_shard, path, start, end, sp)
+                for (start, end), sp in zip(shards, shard_paths)
+            ]
+            for fut in futures:
+                stats = fut.result()
+                ok += stats["ok"]
+                errors += stats["errors"]
+
+        # 合并分片
+        with open(out_path, "wb") as out:
+            for sp in shard_paths:
+                with open(sp, "rb") as part:
+                    shutil.copyfileobj(part, out, 1 << 20)
+    finally:
+        for sp in shard_paths:
+            if os.path.exists(sp):
+                os.remove(sp)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "shards": len(shards),
+        "workers": workers,
+        "ok": ok,
+        "errors": errors,
+        "elapsed_s": round(elapsed, 3),
+        "records_per_s": round((ok + errors) / elapsed, 1) if elapsed > 0 else None,
+    }
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Analyze a large NDJSON dump of job postings.")
+    parser.add_argument("input")
+    parser.add_argument("output")
+    parser.add_argument("--workers", type=int, default=0, help="default: cpu count")
+    parser.add_argument("--shards-per-worker", type=int, default=4)
+    args = parser.parse_args()
+
+    stats = ingest_file(args.input, args.output, args.workers, args.shards_per_worker)
+    print(json.dumps(stats, indent=2))
@@ -0,0 +1,312 @@
+# src/jd_store.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from text_preprocessor import clean_jd_text
+
+# -----------------------------
+# 1) Schema
+# -----------------------------
+# postings 存原文 + 结构化结果；company / seniority 单独成列方便建索引
+# posting_skills 是 (skill, posting_id) 倒排表，技能过滤走索引而不是扫 JSON
+# postings_fts 是 external-content FTS5 表，只存倒排索引，不重复存正文
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS postings (
+    id          INTEGER PRIMARY KEY,
+    url         TEXT,
+    text_hash   TEXT NOT NULL UNIQUE,
+    raw_text    TEXT NOT NULL,
+    company     TEXT NOT NULL DEFAULT '',
+    company_key TEXT NOT NULL DEFAULT '',
+    seniority   TEXT NOT NULL DEFAULT '',
+    job_title   TEXT NOT NULL DEFAULT '',
+    result_json TEXT NOT NULL,
+    created_at  REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_postings_company ON postings(company_key, seniority);
+CREATE INDEX IF NOT EXISTS idx_postings_seniority ON postings(seniority);
+CREATE INDEX IF NOT EXISTS idx_postings_url ON postings(url);
+
+CREATE TABLE IF NOT EXISTS posting_skills (
+    skill_key  TEXT NOT NULL,
+    posting_id INTEGER NOT NULL REFERENCES postings(id) ON DELETE CASCADE,
+    kind       TEXT NOT NULL,
+    PRIMARY KEY (skill_key, posting_id, kind)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_posting_skills_posting ON posting_skills(posting_id);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS postings_fts USING fts5(
+    raw_text, content='postings', content_rowid='id'
+);
+"""
+
+DEFAULT_BATCH_SIZE = 1000
+ANALYZE_LIMIT = 1000
+SKILL_KINDS = ("required", "preferred")
+
+# 设置了这个环境变量才落库；不设就和原来一样，结果用完即丢
+STORE_PATH_ENV = "JD_STORE_PATH"
+
+_default_conn: Optional[sqlite3.Connection] = None
+_default_lock = threading.Lock()
+# 一个连接可能被 Flask 多线程共用，写事务需要串行
+_write_lock = threading.Lock()
+
+
+def text_hash(jd_text: str) -> str:
+    """
+    Hash of the normalized JD text (whitespace collapsed, lower-cased).
+    Used to de-duplicate the same posting pasted / fetched more than once.
+    """
+    norm = clean_jd_text(jd_text or "").lower()
+    return hashlib.sha256(norm.encode("utf-8")).hexdigest()
+
+
+def connect(path: str) -> sqlite3.Connection:
+    """
+    Open (and create if needed) the store at `path`.
+    WAL lets readers (Flask) and a bulk writer run at the same time.
+    """
+    conn = sqlite3.connect(path, check_same_thread=False)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    conn.execute("PRAGMA temp_store=MEMORY")
+    # ANALYZE 只抽样每个索引前 ANALYZE_LIMIT 行：百万行也是毫秒级，给 planner 的比例够用
+    conn.execute(f"PRAGMA analysis_limit={ANALYZE_LIMIT}")
+    conn.executescript(_SCHEMA)
+    if _needs_stats(conn):
+        with _write_lock:
+            conn.execute("ANALYZE")
+            conn.commit()
+    return conn
+
+
+def _needs_stats(conn: sqlite3.Connection) -> bool:
+    # 技能 + 公司这类组合查询该从哪张表驱动，planner 要靠 sqlite_stat1 里的选择度判断
+    has_stats = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'sqlite_stat1'"
+    ).fetchone()
+    if has_stats and conn.execute("SELECT 1 FROM sqlite_stat1 WHERE tbl = 'postings' LIMIT 1").fetchone():
+        return False
+    return conn.execute("SELECT 1 FROM postings LIMIT 1").fetchone() is not None
+
+
+def get_default_store() -> Optional[sqlite3.Connection]:
+    """
+    Shared connection to the store configured by $JD_STORE_PATH, or None.
+    """
+    global _default_conn
+    path = os.environ.get(STORE_PATH_ENV, "").strip()
+    if not path:
+        return None
+    with _default_lock:
+        if _default_conn is None:
+            _default_conn = connect(path)
+        return _default_conn
+
+
+# -----------------------------
+# 2) 写入
+# -----------------------------
+def _skill_rows(result: Dict) -> List[Tuple[str, str]]:
+    rows = set()
+    for kind, key in zip(SKILL_KINDS, ("required_skills", "preferred_skills")):
+        for s in result.get(key, []) or []:
+            if s:
+                rows.add((s.lower(), kind))
+    return sorted(rows)
+
+
+def _insert_one(conn: sqlite3.Connection, jd_text: str, result: Dict,
+                url: Optional[str], now: float) -> Optional[int]:
+    h = text_hash(jd_text)
+    company = (result.get("company") or "").strip()
+    cur = conn.execute(
+        "INSERT OR IGNORE INTO postings "
+        "(url, text_hash, raw_text, company, company_key, seniority, job_title, result_json, created_at) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+        (
+            url,
+            h,
+            jd_text,
+            company,
+            company.lower(),
+            result.get("seniority") or "",
+            result.get("job_title") or "",
+            json.dumps(result, ensure_ascii=False),
+            now,
+        ),
+    )
+    if cur.rowcount == 0:
+        # 同一份 JD 已经存过了
+        return None
+
+    posting_id = cur.lastrowid
+    conn.execute("INSERT INTO postings_fts(rowid, raw_text) VALUES (?, ?)", (posting_id, jd_text))
+    conn.executemany(
+        "INSERT OR IGNORE INTO posting_skills (skill_key, posting_id, kind) VALUES (?, ?, ?)",
+        [(skill, posting_id, kind) for skill, kind in _skill_rows(result)],
+    )
+    return posting_id
+
+
+def save_posting(conn: sqlite3.Connection, jd_text: str, result: Dict,
+                 url: Optional[str] = None) -> Optional[int]:
+    """
+    Store one analyzed posting. Returns the new row id, or None if the
+    same normalized text is already stored.
+    """
+    with _write_lock, conn:
+        return _insert_one(conn, jd_text, result, url, time.time())
+
+
+def bulk_insert(conn: sqlite3.Connection,
+                items: Iterable[Tuple[str, Dict, Optional[str]]],
+                batch_size: int = DEFAULT_BATCH_SIZE) -> int:
+    """
+    Insert (jd_text, result, url) tuples, committing every `batch_size` rows.
+    One transaction per batch instead of per row is what makes this fast.
+    Returns number of newly inserted postings.
+    """
+    inserted = 0
+    batch: List[Tuple[str, Dict, Optional[str]]] = []
+
+    def _flush() -> int:
+        n = 0
+        now = time.time()
+        with _write_lock, conn:
+            for jd_text, result, url in batch:
+                if _insert_one(conn, jd_text, result, url, now) is not None:
+                    n += 1
+        batch.clear()
+        return n
+
+    for item in items:
+        batch.append(item)
+        if len(batch) >= batch_size:
+            inserted += _flush()
+    if batch:
+        inserted += _flush()
+    if inserted:
+        # 大批导入后刷新统计信息，查询计划跟着数据分布走
+        with _write_lock:
+            conn.execute("ANALYZE")
+            conn.commit()
+    return inserted
+
+
+# -----------------------------
+# 3) 查询
+# -----------------------------
+def _fts_query(text: str) -> str:
+    # 每个词都当作短语，避免用户输入里的 - : * 被当成 FTS5 语法
+    terms = [t.replace('"', '""') for t in text.split() if t]
+    return " ".join(f'"{t}"' for t in terms)
+
+
+def search_postings(conn: sqlite3.Connection,
+                    text: Optional[str] = None,
+                    company: Optional[str] = None,
+                    seniority: Optional[str] = None,
+                    skills: Optional[List[str]] = None,
+                    limit: int = 50,
+                    skill_kind: Optional[str] = None) -> List[Dict]:
+    """
+    Filter stored postings, e.g.
+        search_postings(conn, company="Netflix", seniority="Senior",
+                        skills=["PyTorch"], skill_kind="required")
+    All filters are optional and combined with AND. Newest first.
+    skill_kind ("required" / "preferred") restricts how the skills must be
+    mentioned; None matches either.
+    """
+    if skill_kind is not None and skill_kind not in SKILL_KINDS:
+        raise ValueError(f"unknown skill kind: {skill_kind}")
+    where: List[str] = []
+    params: List = []
+    keys = [k.strip().lower() for k in skills or [] if k and k.strip()]
+
+    # 第一个技能驱动查询：从 posting_skills 主键 (skill_key, posting_id, kind) 的
+    # skill_key = ? 那一段按 posting_id 倒序走，常见技能读够 limit 行就停，
+    # 稀有技能只读命中的那几行；company / seniority 留给 join 时的 planner 决定用哪个索引
+    sql = "SELECT p.id, p.url, p.text_hash, p.result_json, p.created_at FROM postings p"
+    if keys:
+        sql = ("SELECT p.id, p.url, p.text_hash, p.result_json, p.created_at "
+               "FROM posting_skills s0 JOIN postings p ON p.id = s0.posting_id")
+        where.append("s0.skill_key = ?")
+        params.append(keys[0])
+        if skill_kind:
+            where.append("s0.kind = ?")
+            params.append(skill_kind)
+        else:
+            # 同一技能既 required 又 preferred 时只取一行（不用 DISTINCT，免得破坏按索引顺序提前停）
+            where.append("(s0.kind = 'required' OR NOT EXISTS (SELECT 1 FROM posting_skills d "
+                         "WHERE d.skill_key = s0.skill_key AND d.posting_id = s0.posting_id "
+                         "AND d.kind = 'required'))")
+
+    if company:
+        where.append("p.company_key = ?")
+        params.append(company.strip().lower())
+    if seniority:
+        where.append("p.seniority = ?")
+        params.append(seniority.strip())
+    # 其余技能：每个候选行按 (posting_id, skill_key) 索引探一次
+    for key in keys[1:]:
+        if skill_kind:
+            where.append("EXISTS (SELECT 1 FROM posting_skills s "
+                         "WHERE s.skill_key = ? AND s.posting_id = p.id AND s.kind = ?)")
+            params.extend((key, skill_kind))
+        else:
+            where.append("EXISTS (SELECT 1 FROM posting_skills s WHERE s.skill_key = ? AND s.posting_id = p.id)")
+            params.append(key)
+    if text and text.strip():
+        where.append("p.id IN (SELECT rowid FROM postings_fts WHERE postings_fts MATCH ?)")
+        params.append(_fts_query(text))
+
+    if where:
+        sql += " WHERE " + " AND ".join(where)
+    sql += " ORDER BY s0.posting_id DESC LIMIT ?" if keys else " ORDER BY p.id DESC LIMIT ?"
+    params.append(int(limit))
+
+    out = []
+    for row in conn.execute(sql, params):
+        out.append({
+            "id": row["id"],
+            "url": row["url"],
+            "text_hash": row["text_hash"],
+            "created_at": row["created_at"],
+            "result": json.loads(row["result_json"]),
+        })
+    return out
+
+
+def find_posting_id(conn: sqlite3.Connection, jd_text: str) -> Optional[int]:
+    """
+    Row id of an already-stored posting with the same normalized text, or None.
+    """
+    row = conn.execute("SELECT id FROM postings WHERE text_hash = ?", (text_hash(jd_text),)).fetchone()
+    return row["id"] if row else None
+
+
+def get_posting(conn: sqlite3.Connection, posting_id: int) -> Optional[Dict]:
+    row = conn.execute(
+        "SELECT id, url, text_hash, raw_text, result_json, created_at FROM postings WHERE id = ?",
+        (posting_id,),
+    ).fetchone()
+    if row is None:
+        return None
+    return {
+        "id": row["id"],
+        "url": row["url"],
+        "text_hash": row["text_hash"],
+        "raw_text": row["raw_text"],
+        "created_at": row["created_at"],
+        "result": json.loads(row["result_json"]),
+    }
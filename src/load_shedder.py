@@ -0,0 +1,189 @@
+# src/load_shedder.py
+
+import os
+import socket
+import struct
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+# 流量突增时不拒绝请求，而是把 /analyze 降到更便宜的分析档位。
+# 信号是“排队时间”：请求到达 -> handler 开始执行之间等了多久。
+#   - 前面有可信代理时用它打的 X-Request-Start 时间戳（JD_SHED_TRUST_REQUEST_START=1 才认，
+#     否则任何客户端都能伪造一个很老的时间戳把 worker 压到 fast）；
+#   - 直连 gunicorn 时用客户端连接的 TCP_INFO.last_data_recv（内核最后一次收到这条连接数据距今多少 ms），
+#     sync worker 里请求排在 listen backlog、gthread 里排在线程池队列，这段时间都算得上。
+# 进程内的服务时间（analyze 本身）看不到排队，只用来给阈值定标：
+#   排队时间 EWMA >= max(下限, 倍数 x full 档服务时间) -> standard / fast
+# 回落时要低于阈值的一半才升档，避免来回抖动。
+
+# JD_SHED_ENABLED=0 关掉降档（永远 full），用来和开启时对比尾延迟
+ENABLED = os.environ.get("JD_SHED_ENABLED", "1").strip().lower() not in ("0", "false", "no", "off")
+STANDARD_WAIT_X = float(os.environ.get("JD_SHED_STANDARD_WAIT_X", "10"))
+FAST_WAIT_X = float(os.environ.get("JD_SHED_FAST_WAIT_X", "40"))
+# 下限：TCP_INFO 的时间是 jiffies 精度（几 ms），再短的排队不当回事
+STANDARD_WAIT_MIN_MS = float(os.environ.get("JD_SHED_STANDARD_MIN_MS", "20"))
+FAST_WAIT_MIN_MS = float(os.environ.get("JD_SHED_FAST_MIN_MS", "80"))
+# 同一进程里正在分析的请求数（gthread 下才会 > 1）
+STANDARD_INFLIGHT = int(os.environ.get("JD_SHED_STANDARD_INFLIGHT", "4"))
+FAST_INFLIGHT = int(os.environ.get("JD_SHED_FAST_INFLIGHT", "8"))
+# 只有确认前面的代理会覆盖（而不是透传）这个头时才打开
+TRUST_REQUEST_START = os.environ.get("JD_SHED_TRUST_REQUEST_START", "0").strip().lower() in ("1", "true", "yes", "on")
+# 单个样本的上限：再离谱的值也只按 10 s 算，EWMA 几个正常请求就能回落
+MAX_WAIT_SAMPLE_MS = 10_000.0
+EWMA_ALPHA = 0.2
+
+_RANK = {"full": 0, "standard": 1, "fast": 2}
+_LEVELS = ("full", "standard", "fast")
+
+# struct tcp_info: 8 个 u8，9 个 u32（rto .. fackets），然后 last_data_sent / last_ack_sent / last_data_recv
+_TCPI_LAST_DATA_RECV = struct.Struct("=I")
+_TCPI_LAST_DATA_RECV_OFFSET = 8 + 4 * 9 + 4 * 2
+_TCP_INFO = getattr(socket, "TCP_INFO", None)
+
+
+def _parse_request_start(value: str, now: float) -> Optional[float]:
+    # nginx: "t=1712345678.123"（秒）；Heroku 等：毫秒或微秒整数
+    value = value.strip()
+    if value.startswith("t="):
+        value = value[2:]
+    try:
+        ts = float(value)
+    except ValueError:
+        return None
+    if ts > 1e14:
+        ts /= 1e6
+    elif ts > 1e11:
+        ts /= 1e3
+    return max(0.0, (now - ts) * 1000)
+
+
+def _socket_idle_ms(sock) -> Optional[float]:
+    if _TCP_INFO is None or sock is None:
+        return None
+    try:
+        info = sock.getsockopt(socket.IPPROTO_TCP, _TCP_INFO, 104)
+    except (OSError, AttributeError):
+        # 非 TCP（unix socket）或平台不支持
+        return None
+    if len(info) < _TCPI_LAST_DATA_RECV_OFFSET + 4:
+        return None
+    return float(_TCPI_LAST_DATA_RECV.unpack_from(info, _TCPI_LAST_DATA_RECV_OFFSET)[0])
+
+
+def request_queue_wait_ms(environ, trust_request_start: bool = TRUST_REQUEST_START) -> Optional[float]:
+    """
+    How long this request waited before the handler started, in ms, or
+    None when it can't be told (dev server, unix socket, non-Linux).
+    X-Request-Start is only used when trust_request_start is set.
+    """
+    if trust_request_start:
+        header = environ.get("HTTP_X_REQUEST_START")
+        if header:
+            wait = _parse_request_start(header, time.time())
+            if wait is not None:
+                return wait
+    return _socket_idle_ms(environ.get("gunicorn.socket"))
+
+
+class LoadShedder:
+    """
+    Picks an analysis level per request from an EWMA of request queue wait
+    (thresholds scaled by the measured full-level service time) and the
+    in-process in-flight count.
+
+        with shedder.track(request_queue_wait_ms(request.environ)) as level:
+            result = analyze_jd(text, level=level)
+    """
+
+    def __init__(self,
+                 standard_wait_x: float = STANDARD_WAIT_X,
+                 fast_wait_x: float = FAST_WAIT_X,
+                 standard_wait_min_ms: float = STANDARD_WAIT_MIN_MS,
+                 fast_wait_min_ms: float = FAST_WAIT_MIN_MS,
+                 standard_inflight: int = STANDARD_INFLIGHT,
+                 fast_inflight: int = FAST_INFLIGHT,
+                 enabled: bool = ENABLED):
+        self.standard_wait_x = standard_wait_x
+        self.fast_wait_x = fast_wait_x
+        self.standard_wait_min_ms = standard_wait_min_ms
+        self.fast_wait_min_ms = fast_wait_min_ms
+        self.standard_inflight = standard_inflight
+        self.fast_inflight = fast_inflight
+        self.enabled = enabled
+
+        self._lock = threading.Lock()
+        self.inflight = 0
+        self.wait_ewma_ms = 0.0
+        self.service_ewma_ms = 0.0     # 只统计 full 档，降档后的更短耗时不拉低阈值
+        self.level = "full"
+
+    def thresholds_ms(self):
+        return (max(self.standard_wait_min_ms, self.standard_wait_x * self.service_ewma_ms),
+                max(self.fast_wait_min_ms, self.fast_wait_x * self.service_ewma_ms))
+
+    def _target_level(self) -> int:
+        standard_ms, fast_ms = self.thresholds_ms()
+        by_wait = 2 if self.wait_ewma_ms >= fast_ms else 1 if self.wait_ewma_ms >= standard_ms else 0
+        by_inflight = (2 if self.inflight >= self.fast_inflight
+                       else 1 if self.inflight >= self.standard_inflight else 0)
+        return max(by_wait, by_inflight)
+
+    def _recovered(self, rank: int) -> bool:
+        # 要降回 rank 档：两个信号都要低于进入 rank+1 档阈值的一半
+        standard_ms, fast_ms = self.thresholds_ms()
+        if rank == 0:
+            return (self.inflight < max(1, self.standard_inflight // 2)
+                    and self.wait_ewma_ms < standard_ms / 2)
+        return (self.inflight < max(1, self.fast_inflight // 2)
+                and self.wait_ewma_ms < fast_ms / 2)
+
+    def _choose(self) -> str:
+        if not self.enabled:
+            return self.level
+        target = self._target_level()
+        current = _RANK[self.level]
+        if target > current:
+            current = target
+        elif target < current and self._recovered(current - 1):
+            current -= 1
+        self.level = _LEVELS[current]
+        return self.level
+
+    @staticmethod
+    def _ewma(old: float, sample: float) -> float:
+        return sample if old == 0.0 else (1 - EWMA_ALPHA) * old + EWMA_ALPHA * sample
+
+    @contextmanager
+    def track(self, queue_wait_ms: Optional[float] = None) -> Iterator[str]:
+        with self._lock:
+            self.inflight += 1
+            if queue_wait_ms is None:
+                # 量不到排队时间：往 0 衰减，不让一个旧的高值把档位一直卡在 fast
+                self.wait_ewma_ms *= 1 - EWMA_ALPHA
+            else:
+                sample = min(max(0.0, queue_wait_ms), MAX_WAIT_SAMPLE_MS)
+                self.wait_ewma_ms = self._ewma(self.wait_ewma_ms, sample)
+            level = self._choose()
+        t0 = time.perf_counter()
+        try:
+            yield level
+        finally:
+            ms = (time.perf_counter() - t0) * 1000
+            with self._lock:
+                self.inflight -= 1
+                if level == "full":
+                    self.service_ewma_ms = self._ewma(self.service_ewma_ms, ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            standard_ms, fast_ms = self.thresholds_ms()
+            return {
+                "level": self.level,
+                "inflight": self.inflight,
+                "wait_ewma_ms": round(self.wait_ewma_ms, 2),
+                "service_ewma_ms": round(self.service_ewma_ms, 2),
+                "standard_wait_ms": round(standard_ms, 2),
+                "fast_wait_ms": round(fast_ms, 2),
+            }
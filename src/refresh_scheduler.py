@@ -0,0 +1,314 @@
+# src/refresh_scheduler.py
+
+import argparse
+import json
+import sqlite3
+import time
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from urllib.parse import urlparse
+
+from html_extractor import extract_job_page_inputs
+from jd_store import get_default_store, save_posting, text_hash
+from run import analyze_jd
+
+# -----------------------------
+# 1) 持久化队列
+# -----------------------------
+# 每个被跟踪的 URL 一行；next_run_at 到了就该刷新
+# status: active（正常）/ gone（页面没了或抽不到正文）/ failed（重试用完）
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tracked_urls (
+    url             TEXT PRIMARY KEY,
+    domain          TEXT NOT NULL,
+    priority        INTEGER NOT NULL DEFAULT 0,
+    interval_s      REAL NOT NULL,
+    next_run_at     REAL NOT NULL,
+    attempts        INTEGER NOT NULL DEFAULT 0,
+    status          TEXT NOT NULL DEFAULT 'active',
+    last_hash       TEXT,
+    last_result     TEXT,
+    last_checked_at REAL,
+    last_changed_at REAL,
+    last_error      TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_tracked_due ON tracked_urls(status, next_run_at, priority);
+"""
+
+DEFAULT_INTERVAL_S = 24 * 3600
+DOMAIN_DELAY_S = 10.0        # 同一个域名两次抓取之间至少隔这么久
+MAX_ATTEMPTS = 5
+BACKOFF_BASE_S = 60.0
+BACKOFF_MAX_S = 6 * 3600
+# 这两个状态码说明招聘页已经下线；渲染后的 404 页面往往还有导航、页脚等文字，不能只靠正文是否为空判断
+GONE_STATUSES = (404, 410)
+
+# fetch 可以只返回 html，也可以返回 (html, HTTP 状态码)
+FetchResult = Union[str, Tuple[str, Optional[int]]]
+
+
+def connect(path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(path)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.executescript(_SCHEMA)
+    return conn
+
+
+def _domain(url: str) -> str:
+    return (urlparse(url).hostname or "").lower()
+
+
+def track_url(conn: sqlite3.Connection, url: str, priority: int = 0,
+              interval_s: float = DEFAULT_INTERVAL_S) -> None:
+    """
+    Start tracking `url` (due immediately). Re-adding an existing URL only
+    updates its priority / interval and re-activates it.
+    """
+    if not interval_s > 0:
+        raise ValueError(f"interval_s must be > 0, got {interval_s}")
+    now = time.time()
+    with conn:
+        conn.execute(
+            "INSERT INTO tracked_urls (url, domain, priority, interval_s, next_run_at) "
+            "VALUES (?, ?, ?, ?, ?) "
+            "ON CONFLICT(url) DO UPDATE SET priority = excluded.priority, "
+            "interval_s = excluded.interval_s, status = 'active', attempts = 0",
+            (url, _domain(url), int(priority), float(interval_s), now),
+        )
+
+
+def untrack_url(conn: sqlite3.Connection, url: str) -> None:
+    with conn:
+        conn.execute("DELETE FROM tracked_urls WHERE url = ?", (url,))
+
+
+def _backoff(attempts: int) -> float:
+    return min(BACKOFF_MAX_S, BACKOFF_BASE_S * (2 ** max(0, attempts - 1)))
+
+
+# -----------------------------
+# 2) 结构化 diff
+# -----------------------------
+def diff_analysis(old: Dict, new: Dict) -> Dict:
+    """
+    Field-level diff of two analyze_jd results.
+    Lists -> {"added": [...], "removed": [...]}, everything else -> {"from": x, "to": y}.
+    Nested dicts (education / skill_buckets) are diffed one level down.
+    """
+    out: Dict = {}
+    for key in sorted(set(old) | set(new)):
+        a, b = old.get(key), new.get(key)
+        if a == b:
+            continue
+        if isinstance(a, dict) or isinstance(b, dict):
+            sub = diff_analysis(a or {}, b or {})
+            if sub:
+                out[key] = sub
+        elif isinstance(a, list) or isinstance(b, list):
+            a_set, b_set = a or [], b or []
+            out[key] = {
+                "added": [x for x in b_set if x not in a_set],
+                "removed": [x for x in a_set if x not in b_set],
+            }
+        else:
+            out[key] = {"from": a, "to": b}
+    return out
+
+
+# -----------------------------
+# 3) 调度
+# -----------------------------
+def _default_fetch(url: str) -> FetchResult:
+    # playwright 只在真正抓取时才需要
+    from fetch_page import fetch_rendered_page
+    return fetch_rendered_page(url)
+
+
+def _print_event(event: Dict) -> None:
+    print(json.dumps(event, ensure_ascii=False))
+
+
+class RefreshScheduler:
+    """
+    Pulls due URLs from the queue (highest priority first), paces requests
+    per domain, and only re-runs the analyzer when the extracted jd_text
+    hash differs from the last run.
+    """
+
+    def __init__(self, conn: sqlite3.Connection,
+                 fetch: Callable[[str], FetchResult] = _default_fetch,
+                 on_event: Callable[[Dict], None] = _print_event,
+                 domain_delay_s: float = DOMAIN_DELAY_S,
+                 max_attempts: int = MAX_ATTEMPTS):
+        self.conn = conn
+        self.fetch = fetch
+        self.on_event = on_event
+        self.domain_delay_s = domain_delay_s
+        self.max_attempts = max_attempts
+        self._domain_next: Dict[str, float] = {}
+
+    def _cooling(self, now: float) -> List[str]:
+        # 顺手清掉已经过了冷却期的域名，字典只留正在冷却的
+        self._domain_next = {d: t for d, t in self._domain_next.items() if t > now}
+        return list(self._domain_next)
+
+    def _next_job(self, now: float, due_by: float) -> Optional[sqlite3.Row]:
+        # 冷却中的域名在 SQL 里就排除掉：否则一个域名的大量到期任务会挡住其它域名
+        return self.conn.execute(
+            "SELECT * FROM tracked_urls WHERE status = 'active' AND next_run_at <= ? "
+            "AND domain NOT IN (SELECT value FROM json_each(?)) "
+            "ORDER BY priority DESC, next_run_at ASC LIMIT 1",
+            (due_by, json.dumps(self._cooling(now))),
+        ).fetchone()
+
+    def _cooldown_wait(self, now: float, due_by: float) -> Optional[float]:
+        # 有到期任务但域名都在冷却：返回最短还要等多久；没有到期任务返回 None
+        domains = [r["domain"] for r in self.conn.execute(
+            "SELECT DISTINCT domain FROM tracked_urls WHERE status = 'active' AND next_run_at <= ?",
+            (due_by,),
+        )]
+        if not domains:
+            return None
+        return max(0.0, min(self._domain_next.get(d, 0.0) for d in domains) - now)
+
+    def process(self, row: sqlite3.Row) -> Dict:
+        url = row["url"]
+        now = time.time()
+        self._domain_next[row["domain"]] = now + self.domain_delay_s
+
+        try:
+            fetched = self.fetch(url)
+            html, status = fetched if isinstance(fetched, tuple) else (fetched, None)
+            if status in GONE_STATUSES:
+                return self._gone(url, now, status)
+            if status is not None and status >= 400:
+                raise RuntimeError(f"HTTP {status}")
+            page_inputs = extract_job_page_inputs(html)
+        except Exception as e:
+            return self._failed(row, now, e)
+
+        jd_text = page_inputs["jd_text"]
+        if not jd_text.strip():
+            return self._gone(url, now, status)
+
+        h = text_hash(jd_text)
+        next_run = now + row["interval_s"]
+        if h == row["last_hash"]:
+            # 内容没变：不跑 analyzer，只推迟下一次
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE tracked_urls SET next_run_at = ?, attempts = 0, last_checked_at = ?, "
+                    "last_error = NULL WHERE url = ?",
+                    (next_run, now, url),
+                )
+            return self._emit({"event": "unchanged", "url": url})
+
+        # 先分析、落库，成功了再记 last_hash：落库失败时下次重试还会当作“有变化”重新处理
+        try:
+            analysis = analyze_jd(jd_text)
+            store = get_default_store()
+            if store is not None:
+                save_posting(store, jd_text, analysis, url=url)
+        except Exception as e:
+            return self._failed(row, now, e)
+
+        old = json.loads(row["last_result"]) if row["last_result"] else None
+        with self.conn:
+            self.conn.execute(
+                "UPDATE tracked_urls SET next_run_at = ?, attempts = 0, last_checked_at = ?, "
+                "last_changed_at = ?, last_hash = ?, last_result = ?, last_error = NULL WHERE url = ?",
+                (next_run, now, now, h, json.dumps(analysis, ensure_ascii=False), url),
+            )
+
+        if old is None:
+            return self._emit({"event": "new", "url": url, "analysis": analysis})
+        return self._emit({"event": "changed", "url": url, "diff": diff_analysis(old, analysis)})
+
+    def _gone(self, url: str, now: float, status: Optional[int]) -> Dict:
+        with self.conn:
+            self.conn.execute(
+                "UPDATE tracked_urls SET status = 'gone', attempts = 0, last_checked_at = ?, "
+                "last_error = NULL WHERE url = ?",
+                (now, url),
+            )
+        return self._emit({"event": "gone", "url": url, "status": status})
+
+    def _failed(self, row: sqlite3.Row, now: float, err: Exception) -> Dict:
+        attempts = row["attempts"] + 1
+        msg = str(err) or err.__class__.__name__
+        if attempts >= self.max_attempts:
+            with self.conn:
+                self.conn.execute(
+                    "UPDATE tracked_urls SET status = 'failed', attempts = ?, last_checked_at = ?, "
+                    "last_error = ? WHERE url = ?",
+                    (attempts, now, msg, row["url"]),
+                )
+            return self._emit({"event": "failed", "url": row["url"], "error": msg})
+
+        retry_at = now + _backoff(attempts)
+        with self.conn:
+            self.conn.execute(
+                "UPDATE tracked_urls SET attempts = ?, next_run_at = ?, last_checked_at = ?, "
+                "last_error = ? WHERE url = ?",
+                (attempts, retry_at, now, msg, row["url"]),
+            )
+        return self._emit({"event": "retry", "url": row["url"], "attempt": attempts,
+                           "retry_at": retry_at, "error": msg})
+
+    def _emit(self, event: Dict) -> Dict:
+        self.on_event(event)
+        return event
+
+    def run_once(self) -> int:
+        """
+        Process every job that is due right now, waiting out domain pacing
+        as needed. Returns number of jobs processed.
+        """
+        # 只处理开始时已经到期的任务：处理过程中又到期的（重试、很短的 interval）留给下一轮
+        started = time.time()
+        n = 0
+        while True:
+            now = time.time()
+            row = self._next_job(now, started)
+            if row is None:
+                wait = self._cooldown_wait(now, started)
+                if wait is None:
+                    return n
+                time.sleep(wait)
+                continue
+            self.process(row)
+            n += 1
+
+    def run_forever(self, poll_s: float = 30.0) -> None:
+        while True:
+            self.run_once()
+            time.sleep(poll_s)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Refresh tracked job posting URLs.")
+    parser.add_argument("--db", default="refresh_queue.db")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p_add = sub.add_parser("add", help="track one or more URLs")
+    p_add.add_argument("urls", nargs="+")
+    p_add.add_argument("--priority", type=int, default=0)
+    p_add.add_argument("--interval", type=float, default=DEFAULT_INTERVAL_S, help="seconds")
+
+    p_run = sub.add_parser("run", help="process due URLs")
+    p_run.add_argument("--forever", action="store_true")
+
+    args = parser.parse_args()
+    if args.cmd == "add" and not args.interval > 0:
+        parser.error("--interval must be > 0")
+    conn = connect(args.db)
+    if args.cmd == "add":
+        for u in args.urls:
+            track_url(conn, u, priority=args.priority, interval_s=args.interval)
+    else:
+        scheduler = RefreshScheduler(conn)
+        if args.forever:
+            scheduler.run_forever()
+        else:
+            scheduler.run_once()
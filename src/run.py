@@ -1,8 +1,9 @@
 # src/run.py
 from text_analyzer import analyze_jd_text
 
-def analyze_jd(jd_text: str) -> dict:
+def analyze_jd(jd_text: str, level: str = "full") -> dict:
     """
     统一入口：给前端/Flask 调用
+    level: "full" / "standard" / "fast"（见 text_analyzer.ANALYSIS_LEVELS）
     """
-    return analyze_jd_text(jd_text)
+    return analyze_jd_text(jd_text, level=level)
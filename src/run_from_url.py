@@ -1,10 +1,12 @@
 # src/run_from_url.py
 
 import json
+import sqlite3
 
 from fetch_page import fetch_rendered_html
 from html_extractor import extract_job_page_inputs
 from run import analyze_jd   # 你已有的 analyzer（或对应文件名）
+from jd_store import get_default_store, save_posting
 
 
 def analyze_job_from_url(url: str) -> dict:
@@ -21,6 +23,14 @@ def analyze_job_from_url(url: str) -> dict:
     print("[3] Running JD analyzer...")
     analysis = analyze_jd(jd_text)
 
+    try:
+        store = get_default_store()
+        if store is not None:
+            save_posting(store, jd_text, analysis, url=url)
+    except sqlite3.Error as e:
+        # 落库失败不影响这次分析结果
+        print(f"[!] Saving to store failed: {e}")
+
     print("[4] Assembling output...")
     final_output = {
     "job_title": job_title,
@@ -0,0 +1,270 @@
+# src/similar_index.py
+
+import argparse
+import json
+import math
+import os
+import re
+import sqlite3
+import threading
+from collections import Counter
+from typing import Dict, Iterator, List, Optional, Tuple
+
+import numpy as np
+
+from jd_store import connect
+
+# -----------------------------
+# 1) 分词
+# -----------------------------
+# 正文词 + 技能词（"skill:python"）一起进向量；技能是 analyzer 抽出来的，信号更强，权重放大
+SKILL_BOOST = 2.0
+INDEX_PATH_ENV = "JD_SIMILAR_INDEX"
+
+_TOKEN = re.compile(r"[a-z0-9+#][a-z0-9+#\-]*")
+_STOPWORDS = {
+    "a", "an", "and", "are", "as", "at", "be", "by", "for", "from", "in", "is", "it",
+    "of", "on", "or", "our", "that", "the", "their", "this", "to", "we", "will", "with",
+    "you", "your", "who", "what", "have", "has", "all", "can", "not", "more",
+}
+
+
+def tokenize(jd_text: str, result: Dict) -> Counter:
+    """
+    Term counts for one posting: words from the text plus one "skill:x"
+    token per extracted skill.
+    """
+    counts = Counter(
+        t for t in _TOKEN.findall((jd_text or "").lower())
+        if len(t) > 1 and t not in _STOPWORDS
+    )
+    skills = set(result.get("required_skills", []) or []) | set(result.get("preferred_skills", []) or [])
+    for s in skills:
+        counts["skill:" + s.lower()] += 1
+    return counts
+
+
+def _weights(counts: Counter, vocab: Dict[str, int], idf: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Sublinear tf * idf, L2-normalized. Returns (term_ids, weights) sorted by term id.
+    """
+    ids, vals = [], []
+    for term, tf in counts.items():
+        j = vocab.get(term)
+        if j is None:
+            continue
+        w = (1.0 + math.log(tf)) * idf[j]
+        if term.startswith("skill:"):
+            w *= SKILL_BOOST
+        ids.append(j)
+        vals.append(w)
+    if not ids:
+        return np.empty(0, dtype=np.int32), np.empty(0, dtype=np.float32)
+
+    ids_arr = np.asarray(ids, dtype=np.int32)
+    vals_arr = np.asarray(vals, dtype=np.float32)
+    vals_arr /= np.linalg.norm(vals_arr)
+    order = np.argsort(ids_arr)
+    return ids_arr[order], vals_arr[order]
+
+
+# -----------------------------
+# 2) 建索引
+# -----------------------------
+def _iter_store(conn: sqlite3.Connection) -> Iterator[Tuple[int, Counter]]:
+    for row in conn.execute("SELECT id, raw_text, result_json FROM postings ORDER BY id"):
+        yield row["id"], tokenize(row["raw_text"], json.loads(row["result_json"]))
+
+
+def _pack_terms(terms: List[str]) -> Dict[str, np.ndarray]:
+    # 词表存成一段 UTF-8 字节 + 偏移量；np.asarray(dtype=str) 是按最长词定宽的 UCS-4，
+    # 一个很长的 "skill:..." 词就能让整个词表的体积翻几十倍
+    encoded = [t.encode("utf-8") for t in terms]
+    offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+    np.cumsum([len(b) for b in encoded], out=offsets[1:])
+    return {
+        "vocab_blob": np.frombuffer(b"".join(encoded), dtype=np.uint8),
+        "vocab_offsets": offsets,
+    }
+
+
+def _unpack_terms(z) -> List[str]:
+    blob = z["vocab_blob"].tobytes()
+    offsets = z["vocab_offsets"].tolist()
+    return [blob[a:b].decode("utf-8") for a, b in zip(offsets, offsets[1:])]
+
+
+class SimilarIndex:
+    """
+    TF-IDF index over stored postings.
+
+    The posting x term matrix is kept transposed (term-major CSR, i.e. the
+    CSC layout of the posting matrix): a query only touches the rows of its
+    own terms, so scoring is a handful of vectorized scatter-adds instead of
+    a full matrix-vector product.
+    """
+
+    def __init__(self, vocab: List[str], idf: np.ndarray, posting_ids: np.ndarray,
+                 indptr: np.ndarray, indices: np.ndarray, data: np.ndarray):
+        self.vocab = {t: i for i, t in enumerate(vocab)}
+        self.terms = vocab
+        self.idf = idf
+        self.posting_ids = posting_ids
+        self.indptr = indptr      # len(vocab) + 1
+        self.indices = indices    # row into posting_ids, ascending within each term
+        self.data = data
+
+    @classmethod
+    def build(cls, conn: sqlite3.Connection, min_df: int = 2, max_df_ratio: float = 0.5) -> "SimilarIndex":
+        # pass 1: 文档频率
+        df: Counter = Counter()
+        n_docs = 0
+        for _, counts in _iter_store(conn):
+            df.update(counts.keys())
+            n_docs += 1
+
+        max_df = max(1, int(max_df_ratio * n_docs))
+        vocab = sorted(t for t, c in df.items() if c >= min_df and (c <= max_df or t.startswith("skill:")))
+        vocab_ix = {t: i for i, t in enumerate(vocab)}
+        idf = np.asarray(
+            [math.log((1 + n_docs) / (1 + df[t])) + 1.0 for t in vocab], dtype=np.float32
+        )
+
+        # pass 2: 按 posting 构造 CSR，再转成按 term 的 CSR
+        posting_ids: List[int] = []
+        row_ptr = [0]
+        cols: List[np.ndarray] = []
+        vals: List[np.ndarray] = []
+        for pid, counts in _iter_store(conn):
+            ids, w = _weights(counts, vocab_ix, idf)
+            posting_ids.append(pid)
+            cols.append(ids)
+            vals.append(w)
+            row_ptr.append(row_ptr[-1] + len(ids))
+
+        col = np.concatenate(cols) if cols else np.empty(0, dtype=np.int32)
+        val = np.concatenate(vals) if vals else np.empty(0, dtype=np.float32)
+        row = np.repeat(np.arange(len(posting_ids), dtype=np.int32), np.diff(row_ptr))
+
+        order = np.argsort(col, kind="stable")   # stable -> row 在每个 term 内保持升序
+        indices = row[order]
+        data = val[order]
+        indptr = np.zeros(len(vocab) + 1, dtype=np.int64)
+        np.cumsum(np.bincount(col, minlength=len(vocab)), out=indptr[1:])
+
+        return cls(vocab, idf, np.asarray(posting_ids, dtype=np.int64), indptr, indices, data)
+
+    # -----------------------------
+    # 3) 持久化
+    # -----------------------------
+    def save(self, path: str) -> None:
+        # 传文件对象，np.savez 不会自作主张再加 .npz 后缀
+        with open(path, "wb") as f:
+            np.savez(
+                f,
+                **_pack_terms(self.terms),
+                idf=self.idf,
+                posting_ids=self.posting_ids,
+                indptr=self.indptr,
+                indices=self.indices,
+                data=self.data,
+            )
+
+    @classmethod
+    def load(cls, path: str) -> "SimilarIndex":
+        with np.load(path, allow_pickle=False) as z:
+            # 旧格式的索引文件存的是定长 unicode 数组 "vocab"
+            terms = _unpack_terms(z) if "vocab_blob" in z.files else z["vocab"].tolist()
+            return cls(terms, z["idf"], z["posting_ids"],
+                       z["indptr"], z["indices"], z["data"])
+
+    # -----------------------------
+    # 4) 查询
+    # -----------------------------
+    def query(self, jd_text: str, result: Dict, k: int = 10,
+              exclude_ids: Optional[set] = None, block_size: int = 0) -> List[Tuple[int, float]]:
+        """
+        Top-k (posting_id, cosine score) for a posting.
+        block_size > 0 scores postings in chunks of that many rows to bound
+        the accumulator memory; 0 scores everything in one pass.
+        """
+        q_ids, q_w = _weights(tokenize(jd_text, result), self.vocab, self.idf)
+        n = len(self.posting_ids)
+        if n == 0 or len(q_ids) == 0:
+            return []
+
+        exclude = set(exclude_ids or ())
+        want = k + len(exclude)
+        block = block_size if block_size > 0 else n
+        cand_rows: List[np.ndarray] = []
+        cand_scores: List[np.ndarray] = []
+
+        for lo in range(0, n, block):
+            hi = min(n, lo + block)
+            scores = np.zeros(hi - lo, dtype=np.float32)
+            for j, w in zip(q_ids, q_w):
+                s, e = self.indptr[j], self.indptr[j + 1]
+                rows = self.indices[s:e]
+                if block < n:
+                    a, b = np.searchsorted(rows, [lo, hi])
+                    rows, vals = rows[a:b], self.data[s + a:s + b]
+                else:
+                    vals = self.data[s:e]
+                # 每个 term 内 row 不重复，直接 fancy-index 累加即可
+                scores[rows - lo] += vals * w
+
+            top = _topk(scores, want)
+            cand_rows.append(top + lo)
+            cand_scores.append(scores[top])
+
+        rows = np.concatenate(cand_rows)
+        scores = np.concatenate(cand_scores)
+        order = np.argsort(-scores, kind="stable")
+
+        out: List[Tuple[int, float]] = []
+        for i in order:
+            if scores[i] <= 0:
+                break
+            pid = int(self.posting_ids[rows[i]])
+            if pid in exclude:
+                continue
+            out.append((pid, round(float(scores[i]), 4)))
+            if len(out) >= k:
+                break
+        return out
+
+
+def _topk(scores: np.ndarray, k: int) -> np.ndarray:
+    if k >= len(scores):
+        return np.arange(len(scores))
+    return np.argpartition(-scores, k)[:k]
+
+
+_default_index: Optional[SimilarIndex] = None
+_default_lock = threading.Lock()
+
+
+def get_default_index() -> Optional[SimilarIndex]:
+    """
+    Index loaded from $JD_SIMILAR_INDEX, or None if not configured.
+    """
+    global _default_index
+    path = os.environ.get(INDEX_PATH_ENV, "").strip()
+    if not path:
+        return None
+    with _default_lock:
+        if _default_index is None:
+            _default_index = SimilarIndex.load(path)
+        return _default_index
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build the TF-IDF index used by /similar.")
+    parser.add_argument("--db", required=True, help="jd_store SQLite file")
+    parser.add_argument("--out", required=True, help="output .npz path")
+    parser.add_argument("--min-df", type=int, default=2)
+    args = parser.parse_args()
+
+    index = SimilarIndex.build(connect(args.db), min_df=args.min_df)
+    index.save(args.out)
+    print(f"indexed {len(index.posting_ids)} postings, {len(index.terms)} terms -> {args.out}")
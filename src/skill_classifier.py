@@ -0,0 +1,184 @@
+# src/skill_classifier.py
+
+import re
+from types import MappingProxyType
+from typing import Dict, FrozenSet, Iterable, List, Mapping, NamedTuple, Set, Tuple
+
+# required / preferred 技能分类引擎（skill_extractor 和 text_analyzer 共用）：
+#   1) 全文切一次句，记下每句起点
+#   2) 全文分一次词；技能关键词和 preferred 触发词都放进同一张 n-gram 表，
+#      每个词最多往后看“最长关键词的词数”个词 -> 代价只和文本长度有关，和技能数量无关
+#   3) 按句子下标 join：句子里有触发词（或处在 "Preferred qualifications" 这类标题行下）-> preferred，否则 required
+# 引擎建好后只读，可以被多个线程同时用。
+
+DEFAULT_PREFERRED_TRIGGERS = (
+    "nice to have",
+    "preferred",
+    "a plus",
+    "plus if",
+    "bonus",
+    "optional",
+)
+
+# 词：字母数字，末尾可以带 ++ 或 #（c++ / c#）；"python+sql"、"#pytorch" 里的 + # 当分隔符。
+# 词之间只允许空格或连字符才能连成短语
+_TOKEN = re.compile(r"[a-z0-9]+(?:\+\+|#)?")
+_SENTENCE_END = re.compile(r"[.!?](?=\s|$)|\n")
+
+# “Preferred qualifications:” 这类小节标题：下面的句子都算 preferred，直到下一个标题。
+# 只认整行、且只由标题用词组成（没有 "with Kubernetes" 这种宾语/动词短语）的行；
+# 以冒号结尾的短行（<= _HEADER_COLON_WORDS 个词）也算。
+_HEADER_NOUNS = (
+    r"(?:\s+(?:and|&|technical|professional|skills?|qualifications?|experiences?|expertise|"
+    r"requirements?|education|knowledge|competencies|abilities))*"
+)
+_PREFERRED_HEADER = re.compile(
+    r"^(?:preferred" + _HEADER_NOUNS + r"|nice[\s-]to[\s-]haves?|bonus(?:\s+points)?|pluses|good\s+to\s+have)\s*:?$"
+)
+_PREFERRED_HEADER_COLON = re.compile(r"^(?:preferred|nice[\s-]to[\s-]have|bonus)\b[^:]*:$")
+_ANY_HEADER = re.compile(
+    r"^(?:(?:required|minimum|basic)" + _HEADER_NOUNS + r"|requirements|qualifications|"
+    r"responsibilities|what\s+you(?:'ll|\s+will)\s+do|about\s+(?:the\s+)?(?:job|role|team|us|you)|"
+    r"your\s+role)\s*:?$"
+)
+_HEADER_COLON_WORDS = 5
+_HEADER_MAX_LEN = 80
+
+_TRIGGER = "\0trigger"
+
+
+class Classification(NamedTuple):
+    required: List[str]
+    preferred: List[str]
+    mentioned: FrozenSet[str]
+
+
+def _phrase_key(text: str) -> Tuple[str, ...]:
+    return tuple(_TOKEN.findall(text.lower()))
+
+
+def _joinable(gap: str) -> bool:
+    # 两个词之间只有空格 / tab / 连字符才算同一个短语
+    return all(ch in " \t-" for ch in gap)
+
+
+class SkillClassifier:
+    """
+    Built once from {label: [keywords...]}; `classify(text)` then costs one
+    pass over the text.
+    """
+
+    def __init__(self, skills: Mapping[str, Iterable[str]],
+                 triggers: Iterable[str] = DEFAULT_PREFERRED_TRIGGERS):
+        phrases: Dict[Tuple[str, ...], Set[str]] = {}
+        for label, keywords in skills.items():
+            for kw in keywords:
+                key = _phrase_key(kw)
+                if key:
+                    phrases.setdefault(key, set()).add(label)
+        for trig in triggers:
+            key = _phrase_key(trig)
+            if key:
+                phrases.setdefault(key, set()).add(_TRIGGER)
+
+        prefixes = set()
+        for key in phrases:
+            for n in range(1, len(key) + 1):
+                prefixes.add(key[:n])
+
+        self._phrases = MappingProxyType({k: frozenset(v) for k, v in phrases.items()})
+        self._prefixes = frozenset(prefixes)
+        self.labels = frozenset(skills)
+
+    def _sentences(self, low: str) -> Tuple[List[int], Set[int]]:
+        """
+        Sentence start offsets, plus the indices of sentences that sit
+        under a "Preferred ..." style header.
+        """
+        starts = [0]
+        for m in _SENTENCE_END.finditer(low):
+            starts.append(m.end())
+
+        scoped: Set[int] = set()
+        in_preferred = False
+        for i, start in enumerate(starts):
+            end = starts[i + 1] if i + 1 < len(starts) else len(low)
+            sent = low[start:end].strip().rstrip(".")
+            if not sent:
+                continue
+            if len(sent) <= _HEADER_MAX_LEN:
+                if _PREFERRED_HEADER.match(sent) or (
+                        _PREFERRED_HEADER_COLON.match(sent) and len(sent.split()) <= _HEADER_COLON_WORDS):
+                    if self._whole_line(low, start, sent):
+                        in_preferred = True
+                        continue
+                elif _ANY_HEADER.match(sent) and self._whole_line(low, start, sent):
+                    in_preferred = False
+                    continue
+            if in_preferred:
+                scoped.add(i)
+        return starts, scoped
+
+    @staticmethod
+    def _whole_line(low: str, start: int, sent: str) -> bool:
+        # 标题必须独占一行：“... . Preferred skills” 这种句中片段不算
+        line_start = low.rfind("\n", 0, start) + 1
+        line_end = low.find("\n", start)
+        if line_end < 0:
+            line_end = len(low)
+        return low[line_start:line_end].strip().rstrip(".") == sent
+
+    def scan(self, text: str) -> Tuple[List[Tuple[int, str]], Set[int]]:
+        """
+        Returns (skill mentions as (sentence_index, label), preferred sentence indices).
+        """
+        low = (text or "").lower()
+        starts, preferred_sents = self._sentences(low)
+        return self._match(low, starts, preferred_sents), preferred_sents
+
+    def mentioned(self, text: str) -> FrozenSet[str]:
+        """
+        Skill labels found anywhere in the text. Token pass only: no
+        sentence split, no header scopes, no required/preferred join.
+        """
+        return frozenset(label for _, label in self._match((text or "").lower(), [0], set()))
+
+    def _match(self, low: str, starts: List[int], preferred_sents: Set[int]) -> List[Tuple[int, str]]:
+        tokens = [(m.start(), m.end(), m.group()) for m in _TOKEN.finditer(low)]
+
+        mentions: List[Tuple[int, str]] = []
+        phrases, prefixes = self._phrases, self._prefixes
+        n_tok, n_sent = len(tokens), len(starts)
+        sent = 0
+        for i in range(n_tok):
+            # 词是按位置顺序来的，句子下标只会往前走
+            while sent + 1 < n_sent and starts[sent + 1] <= tokens[i][0]:
+                sent += 1
+            key = (tokens[i][2],)
+            j = i
+            while key in prefixes:
+                hit = phrases.get(key)
+                if hit:
+                    for label in hit:
+                        if label == _TRIGGER:
+                            preferred_sents.add(sent)
+                        else:
+                            mentions.append((sent, label))
+                j += 1
+                if j >= n_tok or not _joinable(low[tokens[j - 1][1]:tokens[j][0]]):
+                    break
+                key = key + (tokens[j][2],)
+        return mentions
+
+    def classify(self, text: str) -> Classification:
+        """
+        A skill is required if any mention is in a non-preferred sentence,
+        preferred if all of its mentions are in preferred sentences.
+        """
+        mentions, preferred_sents = self.scan(text)
+        required: Set[str] = set()
+        preferred: Set[str] = set()
+        for sent, label in mentions:
+            (preferred if sent in preferred_sents else required).add(label)
+        preferred -= required
+        return Classification(sorted(required), sorted(preferred), frozenset(required | preferred))
@@ -1,50 +1,64 @@
 # src/text_analyzer.py
 import re
+from types import MappingProxyType
 from typing import Dict, List, Tuple
 
-import re
+from skill_classifier import SkillClassifier
+
+# 线程安全约定：
+#   - 模块级状态（词表、编译好的正则、映射表）全部不可变，import 时建好，所有线程共享只读；
+#   - 一次 analyze_jd_text 调用里派生出来的东西都放在 _CallContext 里，不写任何全局变量。
+# 所以同一进程里多个线程（包括 free-threaded CPython）可以同时调用 analyze_jd_text。
 
-_STOP_TITLES = {
+_STOP_TITLES = frozenset({
     "about the job", "introduction", "your role", "your role and responsibilities",
     "responsibilities", "preferred education", "required technical and professional expertise",
     "preferred technical and professional experience", "topics include", "topics include but are not limited to",
-}
-
-import re
+})
 
 # 这些词很容易被误判成“公司”
-_BAD_COMPANY = {
+_BAD_COMPANY = frozenset({
     "about", "about the job", "job", "job overview", "company overview",
     "introduction", "overview", "responsibilities", "what you'll do",
     "what you will do", "requirements", "qualifications", "preferred",
     "education", "skills", "role", "your role", "the role",
     "electrical", "software", "engineering", "computer", "science",
     "data", "analytics", "research"
-}
-
-def extract_company_from_text(jd_text: str) -> str:
+})
+
+_RE_NEWLINES = re.compile(r"\r\n?")
+_RE_COMPANY_LINE = re.compile(r"(?im)^\s*company\s*[:\-]\s*(.+?)\s*$")
+_RE_COMPANY_SPLIT = re.compile(r"\s{2,}|\s*\|\s*|\s*•\s*")
+_RE_AT_COMPANY = re.compile(r"(?im)^\s*(?:at|within)\s+([A-Z][A-Za-z0-9&.\-]{1,40})\b")
+_RE_ACRONYM_IS = re.compile(r"^\s*([A-Z][A-Z0-9&.\-]{1,15})\s+is\b")
+_RE_IBM_RESEARCH = re.compile(r"^\s*(IBM)\s+Research\b", re.IGNORECASE)
+_RE_NAME_IS_A = re.compile(r"^\s*([A-Z][A-Za-z0-9&.\-]{1,40})\s+is\s+(?:a|an|the)\b")
+_RE_BRAND_TOKEN = re.compile(r"\b[A-Z][A-Za-z0-9&.\-]{2,20}\b")
+
+def extract_company_from_text(jd_text: str, use_frequency_fallback: bool = True) -> str:
     """
     Best-effort extract company name from pasted JD text.
     Prefer explicit "Company:" lines, then strong textual signals like:
       - "At Netflix, ..."
       - "IBM Research ..."
       - "KLA is a global leader ..."
+    use_frequency_fallback=False skips the whole-text token count (step 4).
     """
     text = jd_text or ""
-    t = re.sub(r"\r\n?", "\n", text).strip()
+    t = _RE_NEWLINES.sub("\n", text).strip()
     if not t:
         return ""
 
     # 1) Explicit "Company: X"
-    m = re.search(r"(?im)^\s*company\s*[:\-]\s*(.+?)\s*$", t)
+    m = _RE_COMPANY_LINE.search(t)
     if m:
         cand = m.group(1).strip()
-        cand = re.split(r"\s{2,}|\s*\|\s*|\s*•\s*", cand)[0].strip()
+        cand = _RE_COMPANY_SPLIT.split(cand)[0].strip()
         if cand and cand.lower() not in _BAD_COMPANY:
             return cand
 
     # 2) "At {Company}, ..."  (Netflix / Google / Apple)
-    m = re.search(r"(?im)^\s*(?:at|within)\s+([A-Z][A-Za-z0-9&.\-]{1,40})\b", t)
+    m = _RE_AT_COMPANY.search(t)
     if m:
         cand = m.group(1).strip()
         if cand and cand.lower() not in _BAD_COMPANY:
@@ -56,19 +70,19 @@ def extract_company_from_text(jd_text: str) -> str:
     head = " ".join(first_lines)
 
     # 3a) "KLA is a ..." / "IBM is ..."
-    m = re.search(r"^\s*([A-Z][A-Z0-9&.\-]{1,15})\s+is\b", head)
+    m = _RE_ACRONYM_IS.search(head)
     if m:
         cand = m.group(1).strip()
         if cand.lower() not in _BAD_COMPANY:
             return cand
 
     # 3b) "IBM Research ..." -> IBM
-    m = re.search(r"^\s*(IBM)\s+Research\b", head, re.IGNORECASE)
+    m = _RE_IBM_RESEARCH.search(head)
     if m:
         return "IBM"
 
     # 3c) "{Company} is a global leader ..." where Company can be TitleCase too (e.g., "OpenAI is ...")
-    m = re.search(r"^\s*([A-Z][A-Za-z0-9&.\-]{1,40})\s+is\s+(?:a|an|the)\b", head)
+    m = _RE_NAME_IS_A.search(head)
     if m:
         cand = m.group(1).strip()
         if cand.lower() not in _BAD_COMPANY:
@@ -76,7 +90,9 @@ def extract_company_from_text(jd_text: str) -> str:
 
     # 4) Last resort: look for frequent brand-like token (all-caps or TitleCase) that repeats
     #    Keep it conservative to avoid "Electrical".
-    tokens = re.findall(r"\b[A-Z][A-Za-z0-9&.\-]{2,20}\b", t)
+    if not use_frequency_fallback:
+        return ""
+    tokens = _RE_BRAND_TOKEN.findall(t)
     freq = {}
     for w in tokens:
         lw = w.lower()
@@ -97,28 +113,37 @@ def extract_company_from_text(jd_text: str) -> str:
 # -----------------------------
 # 1) 词表：你后面想扩充很容易
 # -----------------------------
-LANGUAGES = ["python", "java", "c++", "c#", "javascript", "typescript", "sql", "nosql", "r", "go", "scala"]
-CLOUD = ["aws", "azure", "gcp", "google cloud", "amazon web services"]
-DATA = ["dataops", "devops", "data engineering", "analytics", "data systems", "database", "databases",
-        "knowledge graph", "knowledge graphs", "multimodal", "multi-modal", "data discovery", "question answering"]
-AI = ["llm", "llms", "large language model", "large language models", "foundation model", "foundation models",
+LANGUAGES = ("python", "java", "c++", "c#", "javascript", "typescript", "sql", "nosql", "r", "go", "scala")
+CLOUD = ("aws", "azure", "gcp", "google cloud", "amazon web services")
+DATA = ("dataops", "devops", "data engineering", "analytics", "data systems", "database", "databases",
+        "knowledge graph", "knowledge graphs", "multimodal", "multi-modal", "data discovery", "question answering")
+AI = ("llm", "llms", "large language model", "large language models", "foundation model", "foundation models",
       "ai agents", "agentic", "rag", "retrieval augmented generation", "prompt", "prompting",
       "prompt optimization", "reinforcement learning", "rl", "planning", "ai planning", "model inference",
-      "generative ai", "genai", "code generation"]
+      "generative ai", "genai", "code generation")
 
-FRAMEWORKS = ["langchain", "llamaindex", "hugging face", "pytorch", "tensorflow", "sklearn", "scikit-learn"]
+FRAMEWORKS = ("langchain", "llamaindex", "hugging face", "pytorch", "tensorflow", "sklearn", "scikit-learn")
 
-DEGREE_WORDS = [
-    ("phd", ["phd", "ph.d", "doctor", "doctoral"]),
-    ("master", ["master", "m.s", "ms", "graduate"]),
-    ("bachelor", ["bachelor", "b.s", "bs", "undergraduate"])
-]
+DEGREE_WORDS = (
+    ("phd", ("phd", "ph.d", "doctor", "doctoral")),
+    ("master", ("master", "m.s", "ms", "graduate")),
+    ("bachelor", ("bachelor", "b.s", "bs", "undergraduate")),
+)
+
+
+def _word_pattern(term: str) -> "re.Pattern":
+    return re.compile(rf"\b{re.escape(term)}\b")
+
+_DEGREE_PATTERNS = tuple(
+    (key, tuple(_word_pattern(v) for v in variants)) for key, variants in DEGREE_WORDS
+)
 
 # -----------------------------
 # 2) 基础清洗
 # -----------------------------
-import re
-from typing import Dict, List, Tuple
+_RE_SPACES = re.compile(r"[ \t]+")
+_RE_BLANK_LINES = re.compile(r"\n{3,}")
+
 
 def _normalize(text: str) -> str:
     if not text:
@@ -137,8 +162,8 @@ def _normalize(text: str) -> str:
     text = text.replace("•", "- ")
 
     # collapse weird spaces
-    text = re.sub(r"[ \t]+", " ", text)
-    text = re.sub(r"\n{3,}", "\n\n", text)
+    text = _RE_SPACES.sub(" ", text)
+    text = _RE_BLANK_LINES.sub("\n\n", text)
 
     return text.strip()
 
@@ -164,30 +189,30 @@ SECTION_HEADERS = [
     "responsibilities",
 ]
 
-def _detect_sections(jd_text: str) -> Dict[str, str]:
+# 标题模式：尽量覆盖常见JD写法（大小写不敏感）
+SECTION_PATTERNS = MappingProxyType({
+    "responsibilities": re.compile(
+        r"^(?:"
+        r"responsibilities|"
+        r"what\s+(?:you['’]ll|you\s+will)\s+do|"
+        r"what\s+(?:you['’]ll|you\s+will)\s+be\s+doing|"
+        r"what\s+(?:you['’]ll|you\s+will)\s+work\s+on|"
+        r"your\s+role(?:\s+and\s+responsibilities)?|"
+        r"role\s+and\s+responsibilities|"
+        r"in\s+this\s+role,?\s+you\s+will|"
+        r"what\s+we['’]re\s+looking\s+for"
+        r")\s*[:\-–—]?\s*$",
+        re.IGNORECASE
+    ),
+})
+
+def _detect_sections(jd_text: str, normalized: bool = False) -> Dict[str, str]:
     """
     Return blocks of text by section key.
     """
-    text = _normalize(jd_text)
+    text = jd_text if normalized else _normalize(jd_text)
     lines = [ln.strip() for ln in text.split("\n")]
 
-    # 标题模式：尽量覆盖常见JD写法（大小写不敏感）
-    SECTION_PATTERNS = {
-        "responsibilities": re.compile(
-            r"^(?:"
-            r"responsibilities|"
-            r"what\s+(?:you['’]ll|you\s+will)\s+do|"
-            r"what\s+(?:you['’]ll|you\s+will)\s+be\s+doing|"
-            r"what\s+(?:you['’]ll|you\s+will)\s+work\s+on|"
-            r"your\s+role(?:\s+and\s+responsibilities)?|"
-            r"role\s+and\s+responsibilities|"
-            r"in\s+this\s+role,?\s+you\s+will|"
-            r"what\s+we['’]re\s+looking\s+for"
-            r")\s*[:\-–—]?\s*$",
-            re.IGNORECASE
-        ),
-    }
-
     # 找到每个 section 的起点行号
     starts: List[Tuple[int, str]] = []
     for i, ln in enumerate(lines):
@@ -220,6 +245,10 @@ def _detect_sections(jd_text: str) -> Dict[str, str]:
 # -----------------------------
 # 4) 抽取：公司 / 职位名 / 级别
 # -----------------------------
+_RE_ORG_VERB = re.compile(r"\b([A-Z][A-Za-z&.\- ]{2,60})\s+(takes|is|means|has|are)\b")
+_RE_BIG_BRANDS = re.compile(r"\b(IBM Research|IBM|Google|Microsoft|Amazon|Meta|Apple)\b")
+
+
 def _extract_company(text: str) -> str:
     """
     尽量从开头/介绍里抓一个组织名。
@@ -229,7 +258,7 @@ def _extract_company(text: str) -> str:
     head = " ".join(lines[:8])
 
     # 常见：IBM Research takes...
-    m = re.search(r"\b([A-Z][A-Za-z&.\- ]{2,60})\s+(takes|is|means|has|are)\b", head)
+    m = _RE_ORG_VERB.search(head)
     if m:
         cand = m.group(1).strip()
         # 过滤掉 "Introduction" 这种标题
@@ -237,7 +266,7 @@ def _extract_company(text: str) -> str:
             return cand
 
     # 兜底：找 IBM / Google / Microsoft 这种大写品牌词
-    m2 = re.search(r"\b(IBM Research|IBM|Google|Microsoft|Amazon|Meta|Apple)\b", text)
+    m2 = _RE_BIG_BRANDS.search(text)
     if m2:
         return m2.group(1)
 
@@ -276,6 +305,10 @@ def _infer_job_title(text: str, company: str, seniority: str) -> str:
 # -----------------------------
 # 5) 学历/专业方向
 # -----------------------------
+_RE_PREFERRED_EDU = re.compile(r"preferred education(.+?)(required technical|preferred technical|$)", re.S)
+_DEGREE_DISPLAY = MappingProxyType({"phd": "PhD", "master": "Master", "bachelor": "Bachelor"})
+
+
 def _extract_degrees(text: str) -> Dict[str, List[str]]:
     """
     返回 required / preferred 两个列表（保证字段存在）
@@ -286,24 +319,24 @@ def _extract_degrees(text: str) -> Dict[str, List[str]]:
     # 优先利用关键词 "required" / "preferred" 周围窗口
     # 但你这份 JD：写了 “Pursuing an undergraduate degree or masters…”，preferred education 又写了 Bachelor
     # 所以：出现就都记录，再做归类
-    for key, variants in DEGREE_WORDS:
-        for v in variants:
-            if re.search(rf"\b{re.escape(v)}\b", low):
+    for key, patterns in _DEGREE_PATTERNS:
+        for pat in patterns:
+            if pat.search(low):
                 # 默认先放 required，再根据 "preferred education" 再补 preferred
                 required.add(key)
 
     # preferred education 段落
-    m = re.search(r"preferred education(.+?)(required technical|preferred technical|$)", low, flags=re.S)
+    m = _RE_PREFERRED_EDU.search(low)
     if m:
         seg = m.group(1)
-        for key, variants in DEGREE_WORDS:
-            for v in variants:
-                if re.search(rf"\b{re.escape(v)}\b", seg):
+        for key, patterns in _DEGREE_PATTERNS:
+            for pat in patterns:
+                if pat.search(seg):
                     preferred.add(key)
 
     # 规范化输出（映射回展示用）
     def _pretty(k: str) -> str:
-        return {"phd": "PhD", "master": "Master", "bachelor": "Bachelor"}.get(k, k)
+        return _DEGREE_DISPLAY.get(k, k)
 
     return {
         "required": sorted({_pretty(x) for x in required}) if required else [],
@@ -330,108 +363,108 @@ def _extract_fields(text: str) -> List[str]:
 # -----------------------------
 # 6) 技能：required vs preferred（按段落/关键词分类）
 # -----------------------------
-def _find_terms(text: str, vocab: List[str]) -> List[str]:
-    low = _lower(text)
-    found = set()
-    for t in vocab:
-        # 兼容 "knowledge graphs" / "knowledge graph"
-        pat = rf"\b{re.escape(t)}\b"
-        if re.search(pat, low):
-            found.add(t)
-    # 输出时做展示友好化
-    return sorted({_pretty_skill(x) for x in found})
+# 常见大写
+_SKILL_DISPLAY = MappingProxyType({
+    "llm": "LLM",
+    "llms": "LLMs",
+    "nosql": "NoSQL",
+    "sql": "SQL",
+    "rag": "RAG",
+    "genai": "Generative AI",
+    "google cloud": "GCP",
+    "amazon web services": "AWS",
+    "knowledge graph": "Knowledge Graphs",
+    "knowledge graphs": "Knowledge Graphs",
+    "multi-modal": "Multimodal",
+    "multimodal": "Multimodal",
+    "ai agents": "AI Agents",
+})
 
 def _pretty_skill(s: str) -> str:
     s = s.strip()
-    # 常见大写
-    mapping = {
-        "llm": "LLM",
-        "llms": "LLMs",
-        "nosql": "NoSQL",
-        "sql": "SQL",
-        "rag": "RAG",
-        "genai": "Generative AI",
-        "google cloud": "GCP",
-        "amazon web services": "AWS",
-        "knowledge graph": "Knowledge Graphs",
-        "knowledge graphs": "Knowledge Graphs",
-        "multi-modal": "Multimodal",
-        "multimodal": "Multimodal",
-        "ai agents": "AI Agents",
-    }
     low = s.lower()
-    if low in mapping:
-        return mapping[low]
+    if low in _SKILL_DISPLAY:
+        return _SKILL_DISPLAY[low]
     # Title Case
     return s[0].upper() + s[1:] if s else s
 
-def _extract_skills(text: str, sections: Dict[str, str]) -> Dict[str, List[str]]:
+# 技能展示名 -> 关键词；展示名 -> 所属分类桶
+_SKILL_BUCKET_VOCABS = (
+    ("languages", LANGUAGES),
+    ("cloud", CLOUD),
+    ("ai_ml", AI),
+    ("data_systems", DATA),
+    ("frameworks", FRAMEWORKS),
+)
+
+
+def _build_skill_tables():
+    keywords: Dict[str, List[str]] = {}
+    buckets: Dict[str, set] = {}
+    for bucket, vocab in _SKILL_BUCKET_VOCABS:
+        for term in vocab:
+            label = _pretty_skill(term)
+            keywords.setdefault(label, []).append(term)
+            buckets.setdefault(label, set()).add(bucket)
+    return (SkillClassifier({k: tuple(v) for k, v in keywords.items()}),
+            MappingProxyType({k: frozenset(v) for k, v in buckets.items()}))
+
+
+_SKILL_ENGINE, _SKILL_LABEL_BUCKETS = _build_skill_tables()
+
+
+def _extract_skills(text: str, classify: bool = True) -> Dict[str, List[str]]:
     """
     required_skills / preferred_skills 同时给出，并且再给分类桶（方便你网页扩展）
+    按句子分类：句子里有 "preferred" / "a plus" 等触发词，或在 "Preferred ..." 小节下 -> preferred
+    classify=False（standard / fast 档）：只扫一遍词，不切句、不分 required / preferred，
+    所有命中的技能都放进 required_skills，preferred_skills 留空
     """
-    full = sections.get("full", text)
-
-    # required 段：required technical...
-    req_seg = sections.get("required technical and professional expertise", "")
-    pref_seg = sections.get("preferred technical and professional experience", "")
-
-    # 如果没有明确段落，就从全文推断
-    if not req_seg:
-        req_seg = full
-    if not pref_seg:
-        pref_seg = ""
-
-    required = set()
-    preferred = set()
-
-    # required：语言/AI/数据/云
-    required.update(_find_terms(req_seg, LANGUAGES))
-    required.update(_find_terms(req_seg, AI))
-    required.update(_find_terms(req_seg, DATA))
-    required.update(_find_terms(req_seg, CLOUD))
-    required.update(_find_terms(req_seg, FRAMEWORKS))
-
-    # preferred：优先从 preferred 段落抓
-    preferred.update(_find_terms(pref_seg, LANGUAGES))
-    preferred.update(_find_terms(pref_seg, AI))
-    preferred.update(_find_terms(pref_seg, DATA))
-    preferred.update(_find_terms(pref_seg, CLOUD))
-    preferred.update(_find_terms(pref_seg, FRAMEWORKS))
-
-    # 这份 JD 的实际“偏好技能”就写在 preferred experience 段里
-    # 再从 “Topics include …” 抓一些核心能力（通常也算 required/核心）
-    topics_seg = sections.get("topics include but are not limited to", "") or sections.get("topics include", "")
-    if topics_seg:
-        required.update(_find_terms(topics_seg, LANGUAGES))
-        required.update(_find_terms(topics_seg, AI))
-        required.update(_find_terms(topics_seg, DATA))
-
-    # 输出时：保证 list
-    required_list = sorted(required)
-    preferred_list = sorted(preferred)
+    if classify:
+        cls = _SKILL_ENGINE.classify(text)
+        required, preferred, mentioned = cls.required, cls.preferred, cls.mentioned
+    else:
+        mentioned = _SKILL_ENGINE.mentioned(text)
+        required, preferred = sorted(mentioned), []
 
     # 分类桶（你网页“完整分析”会更像样）
-    buckets = {
-        "languages": sorted(set(_find_terms(full, LANGUAGES))),
-        "cloud": sorted(set(_find_terms(full, CLOUD))),
-        "ai_ml": sorted(set(_find_terms(full, AI))),
-        "data_systems": sorted(set(_find_terms(full, DATA))),
-        "frameworks": sorted(set(_find_terms(full, FRAMEWORKS))),
-    }
+    buckets: Dict[str, List[str]] = {b: [] for b, _ in _SKILL_BUCKET_VOCABS}
+    for label in sorted(mentioned):
+        for b in _SKILL_LABEL_BUCKETS[label]:
+            buckets[b].append(label)
 
     return {
-        "required_skills": required_list,
-        "preferred_skills": preferred_list,
+        "required_skills": required,
+        "preferred_skills": preferred,
         "skill_buckets": buckets
     }
 
 # -----------------------------
 # 7) 责任/工作内容（bullet抽取）
 # -----------------------------
-def _extract_responsibilities(sections: Dict[str, str]) -> List[str]:
+# 识别更多 bullet 形式：- * • · ● ◦ ‣ 以及 1. 1) (1) 1]
+_BULLET_PAT = re.compile(r"^\s*(?:[•·●▪▫◦‣–—\-*]|\(\d+\)|\d+[.)])\s+(.*)$")
+
+# 一些“像标题”的行：不要当作续行拼进去
+_HEADER_LIKE = re.compile(
+    r"^\s*(?:about\s+the\s+job|company\s+overview|requirements|preferred|education|qualifications|"
+    r"what\s+(?:you['’]ll|you\s+will)\s+do|responsibilities|your\s+role|"
+    r"required\s+technical|preferred\s+technical|skills)\s*[:\-–—]?\s*$",
+    re.IGNORECASE,
+)
+_RE_SENTENCE_END = re.compile(r"(?<=[.!?])\s+")
+_RE_WHITESPACE = re.compile(r"\s+")
+_RE_DUTY_VERB = re.compile(
+    r"\b(you\s+will|you['’]ll|responsible\s+for|design|build|develop|collaborate|implement|maintain|deliver)\b",
+    re.IGNORECASE,
+)
+
+
+def _extract_responsibilities(sections: Dict[str, str], sentence_fallback: bool = True) -> List[str]:
     """
     Extract bullet responsibilities.
     Supports unicode bullets and multiline bullet continuation.
+    sentence_fallback=False only returns real bullets (no sentence splitting).
     """
     block = sections.get("responsibilities", "").strip()
 
@@ -447,17 +480,8 @@ def _extract_responsibilities(sections: Dict[str, str]) -> List[str]:
 
     bullets: List[str] = []
 
-    # 识别更多 bullet 形式：- * • · ● ◦ ‣ 以及 1. 1) (1) 1]
-    bullet_pat = re.compile(r"^\s*(?:[•·●▪▫◦‣–—\-*]|\(\d+\)|\d+[.)])\s+(.*)$")
-
-
-    # 一些“像标题”的行：不要当作续行拼进去
-    header_like = re.compile(
-        r"^\s*(?:about\s+the\s+job|company\s+overview|requirements|preferred|education|qualifications|"
-        r"what\s+(?:you['’]ll|you\s+will)\s+do|responsibilities|your\s+role|"
-        r"required\s+technical|preferred\s+technical|skills)\s*[:\-–—]?\s*$",
-        re.IGNORECASE,
-    )
+    bullet_pat = _BULLET_PAT
+    header_like = _HEADER_LIKE
 
     current = None
 
@@ -484,15 +508,14 @@ def _extract_responsibilities(sections: Dict[str, str]) -> List[str]:
 
         # 如果没有 bullet：尝试从句子里抽取职责（you will / build / design 等）
         # 只在 bullets 为空时做，避免污染已经抽出来的 bullets
-        if not bullets:
+        if not bullets and sentence_fallback:
             # 简单句切分
-            sentences = re.split(r"(?<=[.!?])\s+", re.sub(r"\s+", " ", block).strip())
+            sentences = _RE_SENTENCE_END.split(_RE_WHITESPACE.sub(" ", block).strip())
             for s in sentences:
                 s_clean = s.strip()
                 if not s_clean:
                     continue
-                if re.search(r"\b(you\s+will|you['’]ll|responsible\s+for|design|build|develop|collaborate|implement|maintain|deliver)\b",
-                             s_clean, re.IGNORECASE):
+                if _RE_DUTY_VERB.search(s_clean):
                     bullets.append(s_clean)
             break
 
@@ -511,25 +534,56 @@ def _extract_responsibilities(sections: Dict[str, str]) -> List[str]:
 # -----------------------------
 # 8) 总控：对外接口
 # -----------------------------
-def analyze_jd_text(jd_text: str) -> Dict:
+# 分析档位（负载高时降级用），字段覆盖：
+#   full     - 全部
+#   standard - 不做公司名词频兜底、不做职责的分句兜底（只认 bullet）；
+#              不抽学历（education 留空，十几个正则扫全文，是最贵的一步）；
+#              技能只扫一遍词，不分 required / preferred，全部放进 required_skills
+#   fast     - standard 基础上不切小节（responsibilities / summary 留空）、不抽专业方向（fields 留空）
+#              剩下：公司、级别、职位名、技能（含分类桶 / keywords）
+ANALYSIS_LEVELS = ("full", "standard", "fast")
+
+
+class _CallContext:
+    """
+    Everything one analyze_jd_text call derives from its input. Built fresh
+    per call and never stored anywhere shared, so concurrent calls can't
+    see each other's state.
+    """
+    __slots__ = ("text", "low", "sections")
+
+    def __init__(self, jd_text: str, with_sections: bool = True):
+        self.text = _normalize(jd_text)
+        self.low = _lower(self.text)
+        self.sections = _detect_sections(self.text, normalized=True) if with_sections else {}
+
+
+def analyze_jd_text(jd_text: str, level: str = "full") -> Dict:
     """
     永远返回完整 schema；抽不到就给空/Unknown。
+    level 见 ANALYSIS_LEVELS；实际用的档位写在 "analysis_level" 里。
     """
-    jd_text = _normalize(jd_text)
-    sections = _detect_sections(jd_text)
+    if level not in ANALYSIS_LEVELS:
+        raise ValueError(f"unknown analysis level: {level}")
+    full = level == "full"
+    fast = level == "fast"
 
-    company = extract_company_from_text(jd_text)
+    ctx = _CallContext(jd_text, with_sections=not fast)
+    jd_text = ctx.text
+
+    company = extract_company_from_text(jd_text, use_frequency_fallback=full)
     if not company:
         company = _extract_company(jd_text)  # 你原来的兜底
 
-    seniority = _extract_seniority(jd_text)
-    job_title = _infer_job_title(jd_text, company, seniority)
+    # 下面几个只看小写文本
+    seniority = _extract_seniority(ctx.low)
+    job_title = _infer_job_title(ctx.low, company, seniority)
 
-    degrees = _extract_degrees(jd_text)
-    fields = _extract_fields(jd_text)
+    degrees = _extract_degrees(ctx.low) if full else {"required": [], "preferred": []}
+    fields = [] if fast else _extract_fields(ctx.low)
 
-    skills_pack = _extract_skills(jd_text, sections)
-    responsibilities = _extract_responsibilities(sections)
+    skills_pack = _extract_skills(jd_text, classify=full)
+    responsibilities = [] if fast else _extract_responsibilities(ctx.sections, sentence_fallback=full)
 
     # 你网页想“像样”，最好再给 summary / keywords
     keywords = sorted(set(skills_pack["skill_buckets"]["ai_ml"] + skills_pack["skill_buckets"]["data_systems"]))
@@ -552,5 +606,7 @@ def analyze_jd_text(jd_text: str) -> Dict:
         "skill_buckets": skills_pack["skill_buckets"],
 
         "keywords": keywords,
-        "summary": summary
+        "summary": summary,
+
+        "analysis_level": level
     }
@@ -0,0 +1,113 @@
+# src/warm_start.py
+
+import gc
+import importlib
+import json
+import os
+import time
+from typing import Dict
+
+# gunicorn preload 模式下在 master 里调用：
+#   1) import 所有 analyzer 模块 —— 正则、词表、技能引擎（taxonomy index）、映射表都在 import 时建好；
+#   2) 用一条样例 JD 把整条 pipeline 跑一遍，让第一次调用才会发生的初始化也发生在 master；
+#   3) gc.freeze()：把这些对象移到 GC 的 permanent generation，worker 里的 GC 不再遍历它们，
+#      少写对象头 -> fork 之后共享页不会因为 GC 被 copy-on-write 复制。
+# 有状态的东西（SQLite 连接、线程池、Playwright 浏览器）仍然在 worker 里懒加载，不能跨 fork 共享。
+
+ANALYZER_MODULES = (
+    "text_preprocessor",
+    "skill_classifier",
+    "skill_extractor",
+    "text_analyzer",
+    "run",
+    "html_preprocessor",
+    "html_extractor",
+    "batch_analyzer",
+    "load_shedder",
+    "web_app",
+)
+
+# Playwright 只 import（省掉 worker 里的 import 开销），浏览器进程不能在 fork 前启动
+OPTIONAL_MODULES = ("fetch_page",)
+
+_SAMPLE_JD = """About the job
+At Example, we are hiring a Senior Data Engineer.
+Responsibilities
+- Build scalable data pipelines using Python and SQL on AWS
+- Collaborate with research teams on LLM evaluation
+Required technical and professional expertise
+- Bachelor's degree in Computer Science or related field
+Preferred technical and professional experience
+- Experience with PyTorch is a plus
+"""
+
+_SAMPLE_HTML = (
+    "<html><head><title>Data Engineer at Example | LinkedIn</title>"
+    '<link rel="canonical" href="https://example.com/jobs/data-engineer-at-example-1"></head>'
+    "<body><script>var x = 1;</script><div><section><p>Build pipelines.</p></section></div></body></html>"
+)
+
+
+def build_analyzer_state() -> Dict[str, float]:
+    """
+    Import and exercise every analyzer module once. Returns per-step timings (ms).
+    """
+    timings: Dict[str, float] = {}
+    for name in ANALYZER_MODULES:
+        t0 = time.perf_counter()
+        importlib.import_module(name)
+        timings[f"import:{name}"] = round((time.perf_counter() - t0) * 1000, 2)
+
+    for name in OPTIONAL_MODULES:
+        t0 = time.perf_counter()
+        try:
+            importlib.import_module(name)
+        except ImportError:
+            continue
+        timings[f"import:{name}"] = round((time.perf_counter() - t0) * 1000, 2)
+
+    from html_extractor import extract_job_page_inputs
+    from text_analyzer import ANALYSIS_LEVELS, analyze_jd_text
+
+    t0 = time.perf_counter()
+    for level in ANALYSIS_LEVELS:
+        analyze_jd_text(_SAMPLE_JD, level=level)
+    extract_job_page_inputs(_SAMPLE_HTML)
+    timings["warmup"] = round((time.perf_counter() - t0) * 1000, 2)
+    return timings
+
+
+def freeze_shared_state() -> int:
+    """
+    Collect garbage, then move every surviving object to the permanent
+    generation. Call in the master right before forking workers.
+    Returns the number of frozen objects.
+    """
+    gc.collect()
+    gc.freeze()
+    return gc.get_freeze_count()
+
+
+# -----------------------------
+# worker 启动耗时记录（给 bench/startup_bench.py 用）
+# -----------------------------
+STARTUP_LOG_ENV = "JD_STARTUP_LOG"
+
+
+def record_fork(worker) -> None:
+    worker.jd_forked_at = time.perf_counter()
+
+
+def record_ready(worker) -> None:
+    """
+    Append {"pid", "init_ms"} to $JD_STARTUP_LOG (fork -> worker ready).
+    """
+    path = os.environ.get(STARTUP_LOG_ENV)
+    if not path:
+        return
+    forked = getattr(worker, "jd_forked_at", None)
+    if forked is None:
+        return
+    line = json.dumps({"pid": os.getpid(), "init_ms": round((time.perf_counter() - forked) * 1000, 2)})
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(line + "\n")
@@ -1,8 +1,24 @@
-from flask import Flask, request, render_template, jsonify
+import sqlite3
+
+from flask import Flask, Response, request, render_template, jsonify, stream_with_context
 #from run_from_url import analyze_job_from_url
 from run import analyze_jd
+from jd_store import find_posting_id, get_default_store, get_posting, save_posting
+from batch_analyzer import iter_json_array, iter_ndjson, stream_batch
+from load_shedder import LoadShedder, request_queue_wait_ms
 
 app = Flask(__name__, template_folder="../templates")
+# 每个 worker 进程一个；请求排队变长时 /analyze 自动降到 standard / fast 档
+shedder = LoadShedder()
+
+def _save_to_store(jd_text, result):
+    # 落库是顺带的：库被锁 / 磁盘满时分析结果照样返回，只记一条日志
+    try:
+        store = get_default_store()
+        if store is not None:
+            save_posting(store, jd_text, result)
+    except sqlite3.Error as e:
+        app.logger.warning("saving posting to store failed: %s", e)
 
 @app.route("/", methods=["GET"])
 def index():
@@ -17,7 +33,11 @@ def analyze():
             jd_text = (request.form.get("jd_text") or "").strip()
             if not jd_text:
                 return jsonify({"error": "JD text is required in Text mode."}), 400
-            result = analyze_jd(jd_text)
+            with shedder.track(request_queue_wait_ms(request.environ)) as level:
+                result = analyze_jd(jd_text, level=level)
+            # 降级结果不落库：store 按文本去重，存了就不会再被完整结果覆盖
+            if level == "full":
+                _save_to_store(jd_text, result)
             return jsonify(result)
 
         # mode == "url" (best-effort)
@@ -34,5 +54,75 @@ def analyze():
             msg = f"URL fetch failed (best-effort). Please paste JD text instead. Details: {msg}"
         return jsonify({"error": msg}), 400
 
+@app.route("/analyze/batch", methods=["POST"])
+def analyze_batch():
+    """
+    Body: JSON array (of strings or {"id", "jd_text"}), or NDJSON
+    (Content-Type application/x-ndjson, or a multipart upload field "file").
+    Response: NDJSON, one line per item as it finishes, then a "_stats" line.
+    """
+    upload = request.files.get("file")
+    ctype = (request.mimetype or "").lower()
+
+    try:
+        if upload is not None:
+            objs = iter_ndjson(upload.stream)
+        elif ctype in ("application/x-ndjson", "application/ndjson", "application/jsonl"):
+            # 边读边分析，不把整个 body 先读进内存
+            objs = iter_ndjson(request.stream)
+        else:
+            objs = iter_json_array(request.get_data())
+    except ValueError as e:
+        return jsonify({"error": f"Invalid batch body: {e}"}), 400
+
+    return Response(stream_with_context(stream_batch(objs)), mimetype="application/x-ndjson")
+
+
+@app.route("/similar", methods=["POST"])
+def similar():
+    """
+    Body: form or JSON with "jd_text" and optional "k" (default 10).
+    Returns the k most similar stored postings by TF-IDF cosine.
+    """
+    # 只有配置了索引才加载 numpy 那套
+    from similar_index import get_default_index
+
+    payload = request.get_json(silent=True) or request.form
+    jd_text = (payload.get("jd_text") or "").strip()
+    if not jd_text:
+        return jsonify({"error": "JD text is required."}), 400
+    try:
+        k = max(1, min(100, int(payload.get("k") or 10)))
+    except (TypeError, ValueError):
+        return jsonify({"error": "k must be an integer."}), 400
+
+    index = get_default_index()
+    if index is None:
+        return jsonify({"error": "Similar postings index is not configured."}), 503
+
+    result = analyze_jd(jd_text)
+    store = get_default_store()
+    exclude = set()
+    if store is not None:
+        own_id = find_posting_id(store, jd_text)
+        if own_id is not None:
+            exclude.add(own_id)
+
+    items = []
+    for posting_id, score in index.query(jd_text, result, k=k, exclude_ids=exclude):
+        item = {"id": posting_id, "score": score}
+        stored = get_posting(store, posting_id) if store is not None else None
+        if stored is not None:
+            item.update({
+                "url": stored["url"],
+                "company": stored["result"].get("company", ""),
+                "job_title": stored["result"].get("job_title", ""),
+                "seniority": stored["result"].get("seniority", ""),
+            })
+        items.append(item)
+
+    return jsonify({"similar": items})
+
+
 if __name__ == "__main__":
     app.run(debug=True)